@@ -0,0 +1,73 @@
+"""
+Benchmark for the bulk ingestion pipeline.
+
+Writes a CSV export of random grades for an existing gradebook, then
+ingests it with an increasing number of worker processes and reports
+rows per second.
+
+Usage: python benchmarks/bench_ingest.py [--rows N] [--workers 0 1 2 4]
+"""
+import sys
+import os
+import argparse
+import random
+import tempfile
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from gradebook.ingest import ingest
+from gradebook.service import Gradebook
+from gradebook.storage import save_data
+
+
+def build_data(student_count, course_count=100, per_student=4):
+    """Build a gradebook with empty enrollments."""
+    courses = [{'code': f"C{i:03d}", 'title': f"Course {i}"}
+               for i in range(course_count)]
+    students = [{'id': i, 'name': f"Student {i}"}
+                for i in range(1, student_count + 1)]
+    enrollments = [{'student_id': s['id'],
+                    'course_code': courses[(s['id'] * 7 + k) % course_count]['code'],
+                    'grades': []}
+                   for s in students for k in range(per_student)]
+    return {'students': students, 'courses': courses, 'enrollments': enrollments}
+
+
+def write_csv(path, data, row_count):
+    """Write row_count random grades for existing enrollments."""
+    rng = random.Random(3)
+    enrollments = data['enrollments']
+    with open(path, 'w') as f:
+        f.write("student_id,course_code,grade\n")
+        for _ in range(row_count):
+            e = rng.choice(enrollments)
+            f.write(f"{e['student_id']},{e['course_code']},{rng.randint(0, 100)}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingestion benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--students', type=int, default=50_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4])
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    data = build_data(args.students)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'grades.csv')
+        data_path = os.path.join(tmp, 'gradebook.json')
+        write_csv(csv_path, data, args.rows)
+        print(f"{args.rows} rows, {len(data['enrollments'])} enrollments\n")
+
+        for workers in args.workers:
+            save_data(data, data_path, verbose=False)
+            gradebook = Gradebook(data_path, flush_every=10 ** 9)
+            stats = ingest(csv_path, gradebook, workers=workers,
+                           chunk_size=args.chunk_size)
+            print(f"{workers:>3} workers  {stats['seconds']:7.2f} s  "
+                  f"{stats['rows_per_sec']:12,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
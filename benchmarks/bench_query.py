@@ -0,0 +1,74 @@
+"""
+Benchmark for the query engine at 10^6 enrollments.
+
+Times index building, indexed and streaming filters, group-by
+aggregates and a join.
+
+Usage: python benchmarks/bench_query.py [--enrollments N]
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from gradebook.query import Indexes, run_query
+
+
+def build_data(enrollment_count, course_count=200, per_student=4):
+    """Build a gradebook with the given number of enrollments."""
+    rng = random.Random(7)
+    student_count = enrollment_count // per_student
+    courses = [{'code': f"C{i:03d}", 'title': f"Course {i}"}
+               for i in range(course_count)]
+    students = [{'id': i, 'name': f"Student {i}"}
+                for i in range(1, student_count + 1)]
+    enrollments = []
+    for student in students:
+        for code in rng.sample(courses, per_student):
+            enrollments.append({
+                'student_id': student['id'],
+                'course_code': code['code'],
+                'grades': [rng.randint(40, 100) for _ in range(3)]
+            })
+    return {'students': students, 'courses': courses, 'enrollments': enrollments}
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query benchmark')
+    parser.add_argument('--enrollments', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    data = build_data(args.enrollments)
+    print(f"{len(data['students'])} students, {len(data['courses'])} courses, "
+          f"{len(data['enrollments'])} enrollments\n")
+
+    # The first run builds the indexes a query needs, the second reuses them
+    indexes = Indexes(data)
+    queries = [
+        "enrollments where course_code = C042 count",
+        "enrollments where student_id = 1234",
+        "enrollments where average >= 95 count",
+        "enrollments group by course_code avg grades",
+        "enrollments group by course_code count",
+        "students where courses has C001 and courses has C002",
+        "enrollments join students where course_code = C007 and average < 50 count",
+    ]
+    print(f"{'query':<72} {'first':>8} {'again':>8}")
+    for expression in queries:
+        first = timed(lambda: run_query(expression, data, indexes))
+        again = timed(lambda: run_query(expression, data, indexes))
+        print(f"{expression:<72} {first:7.3f}s {again:7.3f}s")
+
+
+if __name__ == '__main__':
+    main()
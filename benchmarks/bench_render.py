@@ -0,0 +1,63 @@
+"""
+Benchmark for list rendering.
+
+Compares the per-row print loop main.py used for 'list enrollments'
+with the batched renderer in every format. Output goes to a null device
+opened line-buffered, like a terminal, so every flush is a system call.
+
+Usage: python benchmarks/bench_render.py [--rows N]
+"""
+import sys
+import os
+import argparse
+import contextlib
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from gradebook.render import FORMATS, render
+
+COLUMNS = [("Student ID", 'student_id'), ("Course", 'course_code'),
+           ("Grades", 'grades')]
+
+
+def print_rows(enrollments):
+    """The per-row loop main.py used before the rendering layer."""
+    for e in enrollments:
+        if len(e['grades']) > 0:
+            grades_display = ""
+            for grade in e['grades']:
+                grades_display = grades_display + str(grade) + ", "
+            grades_display = grades_display[:-2]
+        else:
+            grades_display = "No grades yet"
+        print("Student ID: " + str(e['student_id']) +
+              ", Course: " + e['course_code'] +
+              ", Grades: [" + grades_display + "]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rendering benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    enrollments = [{'student_id': i // 4 + 1, 'course_code': f"C{i % 100:03d}",
+                    'grades': [70 + i % 30, 85, 90]}
+                   for i in range(args.rows)]
+    print(f"{args.rows} rows\n")
+
+    with open(os.devnull, "w", buffering=1) as out:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(out):
+            print_rows(enrollments)
+        print(f"{'print per row (old)':<22} {time.perf_counter() - start:7.2f} s")
+
+        for fmt in FORMATS:
+            start = time.perf_counter()
+            render(enrollments, COLUMNS, fmt, out)
+            print(f"{'render ' + fmt:<22} {time.perf_counter() - start:7.2f} s")
+
+
+if __name__ == '__main__':
+    main()
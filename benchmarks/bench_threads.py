@@ -0,0 +1,88 @@
+"""
+Multi-threaded throughput benchmark for the Gradebook class.
+
+Runs a mixed workload (mostly reads, some add_grade writes) against one
+shared Gradebook with an increasing number of threads and reports
+operations per second.
+
+Usage: python benchmarks/bench_threads.py [--ops N] [--write-ratio R]
+"""
+import sys
+import os
+import argparse
+import random
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from gradebook.service import Gradebook
+from gradebook.storage import save_data
+
+
+def build_data(student_count, course_count=20):
+    """Build a gradebook where each student is enrolled in 4 courses."""
+    courses = [{'code': f"C{i:03d}", 'title': f"Course {i}"}
+               for i in range(course_count)]
+    students = [{'id': i, 'name': f"Student {i}"}
+                for i in range(1, student_count + 1)]
+    enrollments = [{'student_id': s['id'],
+                    'course_code': courses[(s['id'] + k) % course_count]['code'],
+                    'grades': [70, 80, 90]}
+                   for s in students for k in range(4)]
+    return {'students': students, 'courses': courses, 'enrollments': enrollments}
+
+
+def run(gradebook, keys, thread_count, ops_per_thread, write_ratio):
+    """Run the workload and return the elapsed time in seconds."""
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(ops_per_thread):
+            student_id, course_code = rng.choice(keys)
+            if rng.random() < write_ratio:
+                gradebook.add_grade(student_id, course_code, rng.randint(0, 100))
+            elif rng.random() < 0.5:
+                gradebook.compute_average(student_id, course_code)
+            else:
+                gradebook.compute_gpa(student_id)
+
+    threads = [threading.Thread(target=worker, args=(i,))
+               for i in range(thread_count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    gradebook.flush()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Thread throughput benchmark')
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--ops', type=int, default=200_000)
+    parser.add_argument('--write-ratio', type=float, default=0.05)
+    parser.add_argument('--flush-every', type=int, default=1000)
+    args = parser.parse_args()
+
+    data = build_data(args.students)
+    keys = [(e['student_id'], e['course_code']) for e in data['enrollments']]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'gradebook.json')
+        print(f"{args.ops} ops, write ratio {args.write_ratio}, "
+              f"flush every {args.flush_every} writes\n")
+        for thread_count in (1, 2, 4, 8, 16):
+            save_data(data, path, verbose=False)
+            gradebook = Gradebook(path, flush_every=args.flush_every)
+            elapsed = run(gradebook, keys, thread_count,
+                          args.ops // thread_count, args.write_ratio)
+            print(f"{thread_count:>3} threads  {elapsed:7.3f} s  "
+                  f"{args.ops / elapsed:12,.0f} ops/s")
+
+
+if __name__ == '__main__':
+    main()
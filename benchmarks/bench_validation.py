@@ -0,0 +1,94 @@
+"""
+Benchmark for the validation layer.
+
+Reports the cost of validating one million grades with the per-grade
+checks the old Enrollment constructor used, with validate_grades, with
+trusted mode, and the cost of the load-time integrity scan, for each
+number of grades per enrollment.
+
+Usage: python benchmarks/bench_validation.py [--grades N]
+           [--grades-per-enrollment K [K ...]]
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from gradebook.models import Enrollment
+from gradebook.validation import validate_grades, check_integrity
+
+
+def per_grade_checks(grades):
+    """The loop Enrollment.__init__ used before the validation layer."""
+    for grade in grades:
+        if not isinstance(grade, (int, float)):
+            raise TypeError("Each grade must be a number.")
+        if grade < 0 or grade > 100:
+            raise ValueError("Each grade must be between 0 and 100.")
+
+
+def build_data(total_grades, grades_per_enrollment=10):
+    """Build a valid gradebook dictionary holding total_grades grades."""
+    rng = random.Random(42)
+    enrollment_count = total_grades // grades_per_enrollment
+    student_count = max(1, enrollment_count // 4)
+    courses = [{'code': f"C{i:03d}", 'title': f"Course {i}"}
+               for i in range(50)]
+    students = [{'id': i, 'name': f"Student {i}"}
+                for i in range(1, student_count + 1)]
+    enrollments = []
+    for i in range(enrollment_count):
+        enrollments.append({
+            'student_id': i // 4 + 1,
+            'course_code': courses[i % 50]['code'],
+            'grades': [rng.randint(0, 100) for _ in range(grades_per_enrollment)]
+        })
+    return {'students': students, 'courses': courses, 'enrollments': enrollments}
+
+
+def timed(label, func, total_grades):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    per_million = elapsed * 1_000_000 / total_grades
+    print(f"{label:<32} {elapsed:8.3f} s   {per_million:8.3f} s per 10^6 grades")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validation benchmark')
+    parser.add_argument('--grades', type=int, default=1_000_000)
+    parser.add_argument('--grades-per-enrollment', type=int, nargs='+',
+                        default=[2, 5, 10])
+    args = parser.parse_args()
+
+    for per_enrollment in args.grades_per_enrollment:
+        run(build_data(args.grades, per_enrollment))
+
+
+def run(data):
+    """Time each validation path on data."""
+    enrollments = data['enrollments']
+    total = sum(len(e['grades']) for e in enrollments)
+    print(f"\n{len(enrollments)} enrollments, {total} grades")
+
+    timed("per-grade checks (old)",
+          lambda: [per_grade_checks(e['grades']) for e in enrollments], total)
+    timed("validate_grades",
+          lambda: [validate_grades(e['grades']) for e in enrollments], total)
+    timed("Enrollment(...)",
+          lambda: [Enrollment(e['student_id'], e['course_code'], e['grades'])
+                   for e in enrollments], total)
+    timed("Enrollment(..., trusted=True)",
+          lambda: [Enrollment(e['student_id'], e['course_code'], e['grades'],
+                              trusted=True)
+                   for e in enrollments], total)
+    timed("check_integrity",
+          lambda: check_integrity(data), total)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+Bulk ingestion pipeline for grade exports.
+
+Reads a CSV file with student_id,course_code,grade rows (a header line
+with exactly those names is optional) in three stages:
+
+    reader:    splits the file into chunks of lines
+    workers:   parse and validate chunks in parallel processes, using the
+               same rules as the CLI (validate_student_id, parse_grade,
+               validate_grade)
+    committer: resolves each row against the Gradebook's enrollment index
+               and writes through the storage layer
+
+Queues between the stages are bounded, so a slow committer makes the
+reader wait instead of filling memory. Chunks are committed in file
+order, so the result does not depend on the number of workers.
+"""
+
+import csv
+import multiprocessing
+import queue
+import threading
+import time
+
+from .validation import (validate_student_id, validate_course_code,
+                         parse_grade, validate_grade)
+
+MAX_ERRORS = 100
+HEADER = ['student_id', 'course_code', 'grade']
+
+
+def parse_chunk(start_line, lines):
+    """
+    Parse and validate a chunk of CSV lines.
+
+    Args:
+        start_line: Line number of the first line in the file
+        lines: List of lines without trailing newlines
+
+    Returns:
+        Tuple of (rows, errors) where rows are
+        (student_id, course_code, grade, line) tuples and errors are
+        (line, message) tuples
+    """
+    rows = []
+    errors = []
+    for offset, text in enumerate(lines):
+        line = start_line + offset
+        # Each line is parsed by itself, so a stray quote can't swallow
+        # the lines after it. Only quoted lines need the csv module.
+        if '"' not in text:
+            if not text:
+                continue
+            fields = text.split(",")
+        else:
+            try:
+                fields = next(csv.reader([text]), [])
+            except csv.Error as e:
+                errors.append((line, f"Could not parse line: {e}"))
+                continue
+        if len(fields) != 3:
+            errors.append((line, "Expected 3 fields: student_id,course_code,grade"))
+            continue
+        try:
+            rows.append((validate_student_id(fields[0]),
+                         validate_course_code(fields[1]),
+                         validate_grade(parse_grade(fields[2])),
+                         line))
+        except ValueError as e:
+            errors.append((line, str(e)))
+    return rows, errors
+
+
+def _worker(tasks, results):
+    """Worker process: parse chunks until a None task arrives."""
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        number, start_line, lines = task
+        results.put((number,) + parse_chunk(start_line, lines))
+
+
+def _is_header(line):
+    """Return True if line is the student_id,course_code,grade header."""
+    fields = next(csv.reader([line]), [])
+    return [field.strip().lower() for field in fields] == HEADER
+
+
+def _read_chunks(path, chunk_size):
+    """Yield (number, start line, lines) chunks of a CSV file."""
+    # utf-8-sig drops a byte order mark at the start of the file
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        first = f.readline().rstrip("\r\n")
+        start_line = 1
+        lines = []
+        # Only the exact header is skipped, any other first line is data
+        if _is_header(first):
+            start_line = 2
+        else:
+            lines.append(first)
+
+        number = 0
+        for raw in f:
+            lines.append(raw.rstrip("\r\n"))
+            if len(lines) >= chunk_size:
+                yield number, start_line, lines
+                number += 1
+                start_line += len(lines)
+                lines = []
+        if lines:
+            yield number, start_line, lines
+
+
+def ingest(path, gradebook, workers=0, chunk_size=10000, progress=None):
+    """
+    Ingest a CSV grade export into a gradebook.
+
+    Args:
+        path: Path to the CSV file
+        gradebook: The service.Gradebook to commit to
+        workers: Number of parser processes (0 parses in this process)
+        chunk_size: Lines per chunk
+        progress: Optional function called with the stats after each chunk
+
+    Returns:
+        Dictionary with rows, accepted, rejected, errors (first
+        MAX_ERRORS (line, message) tuples), seconds and rows_per_sec
+    """
+    stats = {'rows': 0, 'accepted': 0, 'rejected': 0, 'errors': [],
+             'seconds': 0.0, 'rows_per_sec': 0.0}
+    start = time.perf_counter()
+
+    def commit(rows, errors):
+        missing = gradebook.add_grades(rows)
+        for row in missing:
+            errors.append((row[3], f"Enrollment not found for student "
+                           f"{row[0]} in course {row[1]}"))
+        stats['rows'] += len(rows) + len(errors) - len(missing)
+        stats['accepted'] += len(rows) - len(missing)
+        stats['rejected'] += len(errors)
+        room = MAX_ERRORS - len(stats['errors'])
+        if room > 0:
+            stats['errors'].extend(sorted(errors)[:room])
+        stats['seconds'] = time.perf_counter() - start
+        if stats['seconds'] > 0:
+            stats['rows_per_sec'] = stats['rows'] / stats['seconds']
+        if progress is not None:
+            progress(stats)
+
+    if workers <= 0:
+        for number, start_line, lines in _read_chunks(path, chunk_size):
+            commit(*parse_chunk(start_line, lines))
+    else:
+        _run_workers(path, workers, chunk_size, commit)
+
+    gradebook.flush()
+    stats['seconds'] = time.perf_counter() - start
+    if stats['seconds'] > 0:
+        stats['rows_per_sec'] = stats['rows'] / stats['seconds']
+    return stats
+
+
+def _run_workers(path, workers, chunk_size, commit):
+    """Run the reader thread and worker processes, committing in order."""
+    tasks = multiprocessing.Queue(maxsize=workers * 2)
+    results = multiprocessing.Queue(maxsize=workers * 2)
+    # Chunks read but not yet committed, including finished chunks that
+    # wait for a slower earlier one, so memory stays bounded
+    in_flight = threading.Semaphore(workers * 4)
+    processes = [multiprocessing.Process(target=_worker, args=(tasks, results),
+                                         daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    chunk_count = []
+    failure = []
+
+    def reader():
+        count = 0
+        try:
+            for chunk in _read_chunks(path, chunk_size):
+                in_flight.acquire()
+                tasks.put(chunk)
+                count += 1
+        except Exception as e:
+            failure.append(e)
+        finally:
+            chunk_count.append(count)
+            for _ in processes:
+                tasks.put(None)
+
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    reader_thread.start()
+
+    finished = False
+    try:
+        waiting = {}
+        next_number = 0
+        while True:
+            if chunk_count and next_number >= chunk_count[0]:
+                break
+            try:
+                number, rows, errors = results.get(timeout=0.5)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processes):
+                    raise RuntimeError("Ingest workers exited unexpectedly")
+                continue
+            waiting[number] = (rows, errors)
+            while next_number in waiting:
+                commit(*waiting.pop(next_number))
+                next_number += 1
+                in_flight.release()
+        finished = True
+    finally:
+        for process in processes:
+            if finished:
+                process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        if finished:
+            reader_thread.join(timeout=5)
+
+    if failure:
+        raise failure[0]
@@ -0,0 +1,136 @@
+"""
+Storage maintenance for gradebook data files.
+
+Contains compaction, verification of the data file and its snapshot
+generations, write amplification estimates for choosing a flush batch
+size, and the background thread the Gradebook uses for timed flushes.
+"""
+
+import json
+import os
+import threading
+import logging
+
+from .storage import save_data, snapshot_path
+from .validation import check_integrity
+
+
+def file_size(path):
+    """Return the size of path in bytes, or 0 if it doesn't exist."""
+    if not os.path.exists(path):
+        return 0
+    return os.path.getsize(path)
+
+
+def list_snapshots(path):
+    """Return the existing snapshot files of path, newest first."""
+    snapshots = []
+    generation = 1
+    while os.path.exists(snapshot_path(path, generation)):
+        snapshots.append(snapshot_path(path, generation))
+        generation += 1
+    return snapshots
+
+
+def compact(path, generations=0):
+    """
+    Rewrite a data file as compact JSON.
+
+    Args:
+        path: Path to the JSON file
+        generations: Number of snapshot generations to keep
+
+    Returns: Tuple of (size before, size after) in bytes
+
+    Raises a ValueError if the file can't be read, so a corrupted file
+    is never replaced by an empty one
+    """
+    before = file_size(path)
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Could not read JSON in '{path}': {e}")
+    after = save_data(data, path, verbose=False, compact=True,
+                      generations=generations)
+    logging.info("Compacted " + path + " from " + str(before) +
+                 " to " + str(after) + " bytes")
+    return before, after
+
+
+def verify(path):
+    """
+    Check the data file and every snapshot generation.
+
+    Args: path: Path to the JSON file
+
+    Returns:
+        List of dictionaries with 'path', 'size' and 'problems' keys,
+        one for the data file followed by one per snapshot
+    """
+    results = []
+    for candidate in [path] + list_snapshots(path):
+        try:
+            with open(candidate, "r") as f:
+                problems = check_integrity(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            problems = [f"Could not read JSON: {e}"]
+        results.append({
+            'path': candidate,
+            'size': file_size(candidate),
+            'problems': problems
+        })
+    return results
+
+
+def estimate_write_amplification(data, batch_sizes):
+    """
+    Estimate write amplification of grade ingestion for each batch size.
+
+    Every flush rewrites the whole file, so adding a batch of b grades of
+    average size r to a file of size S writes S bytes for b * r bytes of
+    new data, an amplification of S / (b * r).
+
+    Args:
+        data: Loaded gradebook data
+        batch_sizes: Iterable of flush_every values to estimate
+
+    Returns: List of (batch size, write amplification) tuples
+    """
+    size = len(json.dumps(data, separators=(',', ':')))
+    grade_count = 0
+    grade_bytes = 0
+    for enrollment in data['enrollments']:
+        grade_count += len(enrollment['grades'])
+        grade_bytes += sum(len(str(g)) + 1 for g in enrollment['grades'])
+    average = grade_bytes / grade_count if grade_count else 3
+
+    return [(b, max(1.0, size / (b * average))) for b in batch_sizes]
+
+
+class BackgroundFlusher(threading.Thread):
+    """
+    Daemon thread that flushes a gradebook every interval seconds.
+
+    Attributes:
+        gradebook: The Gradebook to flush
+        interval: Seconds between flushes
+    """
+
+    def __init__(self, gradebook, interval):
+        super().__init__(name="gradebook-flusher", daemon=True)
+        self.gradebook = gradebook
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.gradebook.flush()
+            except Exception as e:
+                logging.error("Background flush failed: " + str(e))
+
+    def stop(self):
+        """Stop the thread and wait for it to finish."""
+        self._stop_event.set()
+        self.join()
@@ -2,31 +2,37 @@
 Data models for the gradebook application.
 
 Contains Student, Course, and Enrollment classes with validation.
+Every constructor accepts trusted=True to skip the checks for records
+that were already validated (for example bulk loads after an integrity scan).
 """
 
+from .validation import (validate_student_name, validate_course_code,
+                         validate_course_title, validate_grades)
+
 
 class Student:
     """
     Represents a student in the gradebook.
     """
 
-    def __init__(self, id, name):
+    def __init__(self, id, name, trusted=False):
         """
         Create a new Student.
 
         Args:
             id: Student ID (must not be empty)
             name: Student name (must be non-empty string)
+            trusted: Skip validation for already checked data
 
         Raises a ValueError if id is empty or name is invalid
         """
-        if not id:
-            raise ValueError("Students must have an id.")
-        if not isinstance(name, str) or name.strip() == "":
-            raise ValueError("Please provide a valid name.")
+        if not trusted:
+            if not id:
+                raise ValueError("Students must have an id.")
+            name = validate_student_name(name)
 
         self.id = id
-        self.name = name.strip()
+        self.name = name
 
     def __str__(self):
         """Return string representation of the student."""
@@ -42,11 +48,10 @@ class Course:
         title: Course title
     """
 
-    def __init__(self, code, title):
-        if not isinstance(code, str) or code.strip() == "":
-            raise ValueError("Please provide a valid course code like 'CS101'")
-        if not isinstance(title, str) or title.strip() == "":
-            raise ValueError("Please provide a valid title.")
+    def __init__(self, code, title, trusted=False):
+        if not trusted:
+            code = validate_course_code(code)
+            title = validate_course_title(title)
 
         self.code = code
         self.title = title
@@ -70,21 +75,12 @@ class Enrollment:
             TypeError: If grades is not a list or contains non-numeric values
     """
 
-    def __init__(self, student_id, course_code, grades: list):
-        if not student_id:
-            raise ValueError("student_id cannot be empty")
-        if not isinstance(course_code, str) or course_code.strip() == "":
-            raise ValueError("Please provide a valid course code like 'CS101'")
-
-        if not isinstance(grades, list):
-            raise TypeError(
-                "Grades must be provided as a list, e.g., [80, 90, 100].")
-
-        for grade in grades:
-            if not isinstance(grade, (int, float)):
-                raise TypeError("Each grade must be a number.")
-            if grade < 0 or grade > 100:
-                raise ValueError("Each grade must be between 0 and 100.")
+    def __init__(self, student_id, course_code, grades: list, trusted=False):
+        if not trusted:
+            if not student_id:
+                raise ValueError("student_id cannot be empty")
+            course_code = validate_course_code(course_code)
+            validate_grades(grades)
 
         self.student_id = student_id
         self.course_code = course_code
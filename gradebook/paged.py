@@ -0,0 +1,522 @@
+"""
+Paged storage for gradebooks larger than memory.
+
+A paged gradebook is a directory instead of a single JSON file:
+
+    meta.json                 page size, next student ID and the courses
+    students/<page>.jsonl     students with id // page_size == page
+    enrollments/<page>.jsonl  enrollments of those same students
+
+Pages are JSON lines files loaded on demand into an LRU cache whose
+estimated size stays under max_memory. Dirty pages are written back
+when they are evicted or on flush. Because enrollments are paged by
+student, compute_gpa and add_grade touch at most two pages, and
+list_enrollments streams the pages in order without caching them.
+
+convert() builds the directory from a gradebook.json file with a
+streaming parser, so the source file never has to fit in memory.
+Courses are kept in meta.json and assumed to be few.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+
+from .models import Course
+from .validation import validate_student_name, validate_grade
+
+DEFAULT_PAGE_SIZE = 1024
+DEFAULT_MAX_MEMORY = 64 * 1024 * 1024
+
+# Rough ratio between the in-memory size of parsed records (dicts, lists,
+# ints and strings) and their size as JSON text
+MEMORY_FACTOR = 8
+
+_SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2,
+               'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+
+
+def parse_size(text):
+    """
+    Convert a size such as '256MB', '64K' or '1048576' to bytes.
+
+    Raises a ValueError if the size can't be parsed
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*",
+                         str(text).upper())
+    if not match:
+        raise ValueError(f"Invalid size '{text}', expected e.g. 256MB")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def iter_json_items(path, chunk_size=1 << 16):
+    """
+    Stream the items of the top-level arrays of a JSON object.
+
+    Reads the file in chunks and decodes one array item at a time, so
+    memory use depends on the largest item, not on the file size.
+
+    Args:
+        path: Path to a JSON file containing an object
+        chunk_size: Characters to read at a time
+
+    Yields: (key, item) for every item of every top-level array;
+    other top-level values are skipped
+
+    Raises a ValueError if the file is not a JSON object
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def peek():
+            # Return the next non-whitespace character without consuming it
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if eof:
+                    return ""
+                fill()
+
+        def expect(char):
+            nonlocal pos
+            if peek() != char:
+                raise ValueError(f"Expected '{char}' in '{path}'")
+            pos += 1
+
+        def decode():
+            # A value cut off at the end of the buffer may still decode
+            # (e.g. a number), so only accept it if more text follows
+            nonlocal pos
+            peek()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    if end < len(buf) or eof:
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise ValueError(f"Could not read JSON in '{path}'")
+                fill()
+
+        expect("{")
+        if peek() == "}":
+            return
+        while True:
+            key = decode()
+            expect(":")
+            if peek() == "[":
+                pos += 1
+                if peek() == "]":
+                    pos += 1
+                else:
+                    while True:
+                        yield key, decode()
+                        if peek() == ",":
+                            pos += 1
+                        else:
+                            expect("]")
+                            break
+            else:
+                decode()
+            if peek() == ",":
+                pos += 1
+            else:
+                expect("}")
+                return
+
+
+def _page_file(directory, kind, number):
+    return os.path.join(directory, kind, f"{number:06d}.jsonl")
+
+
+def _write_page(path, records):
+    """Write records as JSON lines through a temporary file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(r, separators=(',', ':')) + "\n"
+                     for r in records)
+    os.replace(tmp_path, path)
+
+
+def _read_page(path):
+    """Read a JSON lines page. Returns (records, size in bytes)."""
+    if not os.path.exists(path):
+        return [], 0
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return [json.loads(line) for line in text.splitlines() if line], len(text)
+
+
+def convert(json_path, directory, page_size=DEFAULT_PAGE_SIZE,
+            buffer_records=100000):
+    """
+    Convert a gradebook.json file into a paged directory.
+
+    Records are streamed from the source and appended to their pages in
+    batches of buffer_records, so memory use is bounded by the buffer.
+    The pages are built in a temporary directory next to directory and
+    renamed into place at the end, so a failed conversion leaves no
+    partial gradebook behind.
+
+    Args:
+        json_path: Path to the JSON gradebook
+        directory: Directory to create (must not exist or be empty)
+        page_size: Number of student IDs per page
+        buffer_records: Records to buffer before appending to page files
+
+    Returns: Dictionary with the number of students, courses and enrollments
+
+    Raises a ValueError if directory exists and is not empty
+    """
+    directory = os.path.normpath(directory)
+    if os.path.isdir(directory) and os.listdir(directory):
+        raise ValueError(f"'{directory}' is not empty")
+    if os.path.exists(directory) and not os.path.isdir(directory):
+        raise ValueError(f"'{directory}' is not a directory")
+
+    # Left over from an earlier conversion that failed
+    tmp_directory = directory + ".tmp"
+    if os.path.exists(tmp_directory):
+        shutil.rmtree(tmp_directory)
+    try:
+        counts = _convert(json_path, tmp_directory, page_size, buffer_records)
+        if os.path.isdir(directory):
+            os.rmdir(directory)
+        os.rename(tmp_directory, directory)
+    except BaseException:
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        raise
+    return counts
+
+
+def _convert(json_path, directory, page_size, buffer_records):
+    """Write the pages and meta.json of convert into directory."""
+    for kind in ('students', 'enrollments'):
+        os.makedirs(os.path.join(directory, kind))
+
+    buffers = {}
+    buffered = 0
+    counts = {'students': 0, 'courses': 0, 'enrollments': 0}
+    courses = []
+    max_id = 0
+    pages = set()
+
+    def flush_buffers():
+        for (kind, number), records in buffers.items():
+            with open(_page_file(directory, kind, number), "a",
+                      encoding="utf-8") as f:
+                f.writelines(json.dumps(r, separators=(',', ':')) + "\n"
+                             for r in records)
+        buffers.clear()
+
+    for key, item in iter_json_items(json_path):
+        if key == 'courses':
+            courses.append(item)
+        elif key in ('students', 'enrollments'):
+            student_id = item['id'] if key == 'students' else item['student_id']
+            if key == 'students':
+                max_id = max(max_id, student_id)
+            number = student_id // page_size
+            pages.add(number)
+            buffers.setdefault((key, number), []).append(item)
+            buffered += 1
+            if buffered >= buffer_records:
+                flush_buffers()
+                buffered = 0
+        else:
+            continue
+        counts[key] += 1
+    flush_buffers()
+
+    meta = {'page_size': page_size, 'next_id': max_id + 1,
+            'pages': max(pages) + 1 if pages else 0, 'courses': courses}
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return counts
+
+
+class _Page:
+    """A loaded page: its records, estimated memory size and dirty flag."""
+
+    __slots__ = ('records', 'size', 'dirty')
+
+    def __init__(self, records, size):
+        self.records = records
+        self.size = size
+        self.dirty = False
+
+
+class PagedGradebook:
+    """
+    Gradebook backed by a paged directory with a bounded page cache.
+
+    Has the same methods as service.Gradebook, except that
+    list_students returns students in ID order and the list_* methods
+    return iterators. A single lock serializes all operations.
+
+    Attributes:
+        directory: Path of the paged gradebook
+        max_memory: Budget in bytes for cached pages
+    """
+
+    def __init__(self, directory, max_memory=DEFAULT_MAX_MEMORY):
+        """
+        Open a paged gradebook created by convert().
+
+        Args:
+            directory: Path of the paged gradebook
+            max_memory: Budget in bytes (or a size like '256MB') for cached pages
+        """
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            raise ValueError(f"No paged gradebook found in '{directory}'")
+        with open(meta_path, "r", encoding="utf-8") as f:
+            self._meta = json.load(f)
+
+        self.directory = directory
+        self.max_memory = parse_size(max_memory) if isinstance(
+            max_memory, str) else max_memory
+        self._page_size = self._meta['page_size']
+        self._courses = {c['code']: c for c in self._meta['courses']}
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._meta_dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def cached_bytes(self):
+        """Estimated memory used by cached pages."""
+        return self._cached_bytes
+
+    def _page(self, kind, number):
+        """Return a page from the cache, loading it (and evicting) if needed."""
+        key = (kind, number)
+        page = self._cache.get(key)
+        if page is not None:
+            self._cache.move_to_end(key)
+            return page
+
+        records, size = _read_page(_page_file(self.directory, kind, number))
+        page = _Page(records, size * MEMORY_FACTOR)
+        self._cache[key] = page
+        self._cached_bytes += page.size
+        self._evict()
+        return page
+
+    def _evict(self):
+        """Drop least recently used pages until the cache fits the budget."""
+        while self._cached_bytes > self.max_memory and len(self._cache) > 1:
+            (kind, number), page = self._cache.popitem(last=False)
+            if page.dirty:
+                _write_page(_page_file(self.directory, kind, number),
+                            page.records)
+            self._cached_bytes -= page.size
+
+    def _grow(self, page, json_bytes):
+        """Account for data added to a cached page."""
+        page.dirty = True
+        page.size += json_bytes * MEMORY_FACTOR
+        self._cached_bytes += json_bytes * MEMORY_FACTOR
+        self._evict()
+
+    def _find_student(self, student_id):
+        page = self._page('students', student_id // self._page_size)
+        for student in page.records:
+            if student['id'] == student_id:
+                return student
+        return None
+
+    def _enrollment_page(self, student_id):
+        return self._page('enrollments', student_id // self._page_size)
+
+    def _scan(self, kind):
+        """
+        Yield the records of each page, one list per page, in page order.
+
+        Pages that are not cached are read straight from disk and not
+        added to the cache, so a full scan doesn't evict the working set.
+        """
+        for number in range(self._meta['pages']):
+            with self._lock:
+                page = self._cache.get((kind, number))
+                if page is not None:
+                    records = list(page.records)
+                else:
+                    records, _ = _read_page(
+                        _page_file(self.directory, kind, number))
+            yield records
+
+    def flush(self):
+        """Write dirty pages and the metadata to disk."""
+        with self._lock:
+            for (kind, number), page in self._cache.items():
+                if page.dirty:
+                    _write_page(_page_file(self.directory, kind, number),
+                                page.records)
+                    page.dirty = False
+            if self._meta_dirty:
+                meta_path = os.path.join(self.directory, "meta.json")
+                with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(self._meta, f)
+                os.replace(meta_path + ".tmp", meta_path)
+                self._meta_dirty = False
+
+    def close(self):
+        """Flush any pending changes."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_student(self, name):
+        """Add a new student. Returns the new student ID."""
+        name = validate_student_name(name)
+        with self._lock:
+            new_id = self._meta['next_id']
+            self._meta['next_id'] = new_id + 1
+            self._meta['pages'] = max(self._meta['pages'],
+                                      new_id // self._page_size + 1)
+            self._meta_dirty = True
+            record = {'id': new_id, 'name': name}
+            page = self._page('students', new_id // self._page_size)
+            page.records.append(record)
+            self._grow(page, len(json.dumps(record)))
+        return new_id
+
+    def add_course(self, code, title):
+        """
+        Add a new course. Returns the new Course object.
+
+        Raises a ValueError if course code already exists or is invalid
+        """
+        new_course = Course(code, title)
+        with self._lock:
+            if new_course.code in self._courses:
+                raise ValueError(
+                    f"Course with code {new_course.code} already exists")
+            record = {'code': new_course.code, 'title': new_course.title}
+            self._meta['courses'].append(record)
+            self._courses[new_course.code] = record
+            self._meta_dirty = True
+        return new_course
+
+    def enroll(self, student_id, course_code):
+        """
+        Enroll a student in a course.
+
+        Raises a ValueError if the student or course does not exist,
+        or the student is already enrolled
+        """
+        with self._lock:
+            if self._find_student(student_id) is None:
+                raise ValueError(f"No student found with ID {student_id}.")
+            if course_code not in self._courses:
+                raise ValueError(f"No course found with code '{course_code}'.")
+            page = self._enrollment_page(student_id)
+            if any(e['student_id'] == student_id and e['course_code'] == course_code
+                   for e in page.records):
+                raise ValueError(
+                    f"Student {student_id} is already enrolled in {course_code}.")
+            record = {'student_id': student_id, 'course_code': course_code,
+                      'grades': []}
+            page.records.append(record)
+            self._grow(page, len(json.dumps(record)))
+
+    def _find_enrollment(self, student_id, course_code):
+        page = self._enrollment_page(student_id)
+        for enrollment in page.records:
+            if (enrollment['student_id'] == student_id
+                    and enrollment['course_code'] == course_code):
+                return page, enrollment
+        raise ValueError(
+            f"Enrollment not found for student {student_id} in course {course_code}")
+
+    def add_grade(self, student_id, course_code, grade):
+        """
+        Add a grade for a student in a course.
+
+        Raises:
+            TypeError: If grade is not a number
+            ValueError: If grade is not between 0 and 100
+            ValueError: If enrollment not found
+        """
+        validate_grade(grade)
+        with self._lock:
+            page, enrollment = self._find_enrollment(student_id, course_code)
+            enrollment['grades'].append(grade)
+            self._grow(page, len(str(grade)) + 1)
+
+    def compute_average(self, student_id, course_code):
+        """
+        Compute the average grade for a student in a course.
+
+        Returns: Average grade as a float, or 0.0 if no grades
+
+        Raises: ValueError: If enrollment not found
+        """
+        with self._lock:
+            _, enrollment = self._find_enrollment(student_id, course_code)
+            grades = enrollment['grades']
+            return sum(grades) / len(grades) if grades else 0.0
+
+    def compute_gpa(self, student_id):
+        """
+        Compute the GPA for a student across all courses.
+
+        Returns: GPA as a float, or 0.0 if no grades
+
+        Raises: ValueError: If student not found
+        """
+        with self._lock:
+            if self._find_student(student_id) is None:
+                raise ValueError(f"Student {student_id} not found")
+            course_averages = [sum(e['grades']) / len(e['grades'])
+                               for e in self._enrollment_page(student_id).records
+                               if e['student_id'] == student_id and e['grades']]
+        if not course_averages:
+            return 0.0
+        return sum(course_averages) / len(course_averages)
+
+    def list_students(self):
+        """Iterate over all students in ID order."""
+        for records in self._scan('students'):
+            yield from sorted(records, key=lambda s: s['id'])
+
+    def list_courses(self):
+        """Get a sorted list of all courses."""
+        with self._lock:
+            return sorted((dict(c) for c in self._courses.values()),
+                          key=lambda c: c["code"].lower())
+
+    def list_enrollments(self):
+        """
+        Iterate over all enrollments sorted by student ID and course.
+
+        Pages cover increasing student ID ranges, so sorting inside each
+        page gives a globally sorted stream.
+        """
+        for records in self._scan('enrollments'):
+            yield from sorted(records, key=lambda e: (e['student_id'],
+                                                      e['course_code']))
+
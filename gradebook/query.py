@@ -0,0 +1,483 @@
+"""
+Query engine for ad-hoc filtering and grouping over gradebook data.
+
+Queries can be built in Python with the Query class or parsed from a
+small expression language:
+
+    <table> [join <table>]... [where <field> <op> <value> [and ...]]
+            [group by <field>] [count | avg|min|max|sum <field>]
+            [sort <field> [desc]] [limit <n>]
+
+Tables are students, courses and enrollments. Operators are
+=, !=, <, <=, >, >= and has (membership in a list field).
+Besides the stored fields, rows have derived fields:
+
+    students:     courses (list of course codes), gpa
+    courses:      enrolled (number of enrolled students)
+    enrollments:  average, grade_count
+
+Examples:
+
+    enrollments group by course_code avg grades
+    enrollments group by course_code count
+    students where courses has CS101 and courses has MATH201
+    enrollments join students where average < 60 sort average
+
+Equality on an indexed field (students.id, courses.code,
+enrollments.student_id, enrollments.course_code) and "courses has"
+on students use hash indexes; other predicates are checked while
+streaming over the rows.
+"""
+
+import operator
+import shlex
+from collections import defaultdict
+
+TABLES = ('students', 'courses', 'enrollments')
+AGGREGATES = ('count', 'avg', 'min', 'max', 'sum')
+
+
+def _has(container, value):
+    return container is not None and value in container
+
+
+OPERATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'has': _has,
+}
+
+# (left table, right table) -> (left field, right field)
+JOINS = {
+    ('enrollments', 'students'): ('student_id', 'id'),
+    ('enrollments', 'courses'): ('course_code', 'code'),
+    ('students', 'enrollments'): ('id', 'student_id'),
+    ('courses', 'enrollments'): ('code', 'course_code'),
+}
+
+# table -> fields computed from other records
+DERIVED_FIELDS = {
+    'students': ('courses', 'gpa'),
+    'courses': ('enrolled',),
+    'enrollments': ('average', 'grade_count'),
+}
+
+# table -> fields that have an equality index
+INDEXED_FIELDS = {
+    'students': ('id',),
+    'courses': ('code',),
+    'enrollments': ('student_id', 'course_code'),
+}
+
+
+def _average(grades):
+    return sum(grades) / len(grades) if grades else None
+
+
+class Indexes:
+    """
+    Hash indexes over gradebook data, built lazily and reused.
+
+    Attributes:
+        data: Dictionary with students, courses and enrollments lists
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._built = {}
+
+    def get(self, table, field):
+        """
+        Get the index for table.field.
+
+        Returns: Dictionary of field value -> list of records
+        """
+        key = (table, field)
+        if key not in self._built:
+            index = defaultdict(list)
+            for record in self.data[table]:
+                index[record.get(field)].append(record)
+            self._built[key] = dict(index)
+        return self._built[key]
+
+
+class Query:
+    """
+    A query over one table, built with chained calls.
+
+    Example:
+        Query(data, 'enrollments').group_by('course_code').aggregate('avg', 'grades').run()
+    """
+
+    def __init__(self, data, table, indexes=None):
+        if table not in TABLES:
+            raise ValueError(
+                f"Unknown table '{table}', expected one of {', '.join(TABLES)}")
+        self.data = data
+        self.table = table
+        self.indexes = indexes if indexes is not None else Indexes(data)
+        self.joins = []
+        self.predicates = []
+        self.group_field = None
+        self.aggregate_func = None
+        self.aggregate_field = None
+        self.sort_field = None
+        self.sort_desc = False
+        self.limit_count = None
+
+    def join(self, table):
+        """Inner join another table on its key."""
+        if table not in TABLES:
+            raise ValueError(f"Unknown table '{table}'")
+        for left in [self.table] + self.joins:
+            if (left, table) in JOINS:
+                self.joins.append(table)
+                return self
+        raise ValueError(f"Cannot join {table} to {self.table}")
+
+    def where(self, field, op, value):
+        """Keep only rows where field <op> value."""
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator '{op}'")
+        self.predicates.append((field, op, value))
+        return self
+
+    def group_by(self, field):
+        """Group rows by field. Defaults to a count per group."""
+        self.group_field = field
+        return self
+
+    def aggregate(self, func, field=None):
+        """Aggregate rows (or each group) with count, avg, min, max or sum."""
+        if func not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate '{func}'")
+        if func != 'count' and field is None:
+            raise ValueError(f"Aggregate '{func}' needs a field")
+        self.aggregate_func = func
+        self.aggregate_field = field
+        return self
+
+    def sort(self, field, desc=False):
+        """Sort the result by field."""
+        self.sort_field = field
+        self.sort_desc = desc
+        return self
+
+    def limit(self, count):
+        """Return at most count rows."""
+        self.limit_count = count
+        return self
+
+    def _referenced_fields(self):
+        fields = {p[0] for p in self.predicates}
+        fields.update(f for f in (self.group_field, self.aggregate_field,
+                                  self.sort_field) if f)
+        return fields
+
+    def _derived(self, table, record, fields):
+        """Return the derived fields of record that the query uses."""
+        derived = {}
+        if table == 'students':
+            if 'courses' in fields or 'gpa' in fields:
+                enrollments = self.indexes.get(
+                    'enrollments', 'student_id').get(record['id'], [])
+                if 'courses' in fields:
+                    derived['courses'] = [e['course_code'] for e in enrollments]
+                if 'gpa' in fields:
+                    averages = [_average(e['grades'])
+                                for e in enrollments if e['grades']]
+                    derived['gpa'] = _average(averages) or 0.0
+        elif table == 'courses':
+            if 'enrolled' in fields:
+                derived['enrolled'] = len(self.indexes.get(
+                    'enrollments', 'course_code').get(record['code'], []))
+        elif table == 'enrollments':
+            if 'average' in fields:
+                derived['average'] = _average(record['grades'])
+            if 'grade_count' in fields:
+                derived['grade_count'] = len(record['grades'])
+        return derived
+
+    def _candidates(self):
+        """
+        Return the base records to scan.
+
+        Uses an index when a predicate allows it, otherwise streams
+        the whole table.
+        """
+        candidates = None
+        for field, op, value in self.predicates:
+            if op == '=' and field in INDEXED_FIELDS[self.table]:
+                matches = self.indexes.get(self.table, field).get(value, [])
+            elif (op == 'has' and self.table == 'students'
+                  and field == 'courses'):
+                enrollments = self.indexes.get(
+                    'enrollments', 'course_code').get(value, [])
+                by_id = self.indexes.get('students', 'id')
+                matches = [s for e in enrollments
+                           for s in by_id.get(e['student_id'], [])]
+            else:
+                continue
+
+            if candidates is None:
+                candidates = matches
+            else:
+                ids = {id(r) for r in matches}
+                candidates = [r for r in candidates if id(r) in ids]
+
+        if candidates is None:
+            return iter(self.data[self.table])
+        return iter(candidates)
+
+    def rows(self):
+        """
+        Yield the matching rows (before grouping, sorting and limit).
+
+        Rows without joins or derived fields are the stored records
+        themselves, so callers must not modify them.
+        """
+        fields = self._referenced_fields()
+        checks = [(field, OPERATORS[op], value)
+                  for field, op, value in self.predicates]
+        extend = self.joins or fields.intersection(DERIVED_FIELDS[self.table])
+
+        for record in self._candidates():
+            if not extend:
+                joined = (record,)
+            else:
+                row = dict(record)
+                row.update(self._derived(self.table, record, fields))
+                joined = [row]
+                tables = [self.table]
+                for table in self.joins:
+                    joined = self._join_rows(joined, tables, table, fields)
+                    tables.append(table)
+            for row in joined:
+                if all(_compare(check, row.get(field), value)
+                       for field, check, value in checks):
+                    yield row
+
+    def _join_rows(self, rows, tables, table, fields):
+        """Join each row with the matching records of table."""
+        for left in tables:
+            if (left, table) in JOINS:
+                left_field, right_field = JOINS[(left, table)]
+                break
+        index = self.indexes.get(table, right_field)
+        result = []
+        for row in rows:
+            for record in index.get(row.get(left_field), []):
+                merged = dict(row)
+                for key, value in record.items():
+                    merged.setdefault(key, value)
+                for key, value in self._derived(table, record, fields).items():
+                    merged.setdefault(key, value)
+                result.append(merged)
+        return result
+
+    def run(self):
+        """
+        Run the query.
+
+        Returns: List of row dictionaries, or one row per group
+        (a single row without group by) when aggregating
+        """
+        func = self.aggregate_func
+        if self.group_field is not None and func is None:
+            func = 'count'
+
+        if func is None:
+            # Copy list values too, so callers can't change the grades
+            # lists of the stored enrollments
+            result = ({key: list(value) if type(value) is list else value
+                       for key, value in row.items()}
+                      for row in self.rows())
+        elif self.group_field is None:
+            total = _Accumulator(func)
+            for row in self.rows():
+                total.add(row, self.aggregate_field)
+            result = [{_result_name(func, self.aggregate_field): total.result()}]
+        else:
+            groups = {}
+            group_field = self.group_field
+            for row in self.rows():
+                key = _hashable(row.get(group_field))
+                accumulator = groups.get(key)
+                if accumulator is None:
+                    accumulator = groups[key] = _Accumulator(func)
+                accumulator.add(row, self.aggregate_field)
+            name = _result_name(func, self.aggregate_field)
+            result = [{group_field: key, name: accumulator.result()}
+                      for key, accumulator in groups.items()]
+            if self.sort_field is None:
+                result.sort(key=lambda r: _sort_key(r[self.group_field]))
+
+        if self.sort_field is not None:
+            result = sorted(result, key=lambda r: _sort_key(r.get(self.sort_field)),
+                            reverse=self.sort_desc)
+        result = list(result) if self.limit_count is None else \
+            [row for _, row in zip(range(self.limit_count), result)]
+        return result
+
+
+def _compare(check, left, right):
+    try:
+        return check(left, right)
+    except TypeError:
+        return False
+
+
+def _hashable(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _sort_key(value):
+    # None sorts first, numbers before strings
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, str(value))
+
+
+def _result_name(func, field):
+    return func if field is None else f"{func}_{field}"
+
+
+class _Accumulator:
+    """
+    Running aggregate for one group.
+
+    List values such as grades are flattened, None values are skipped.
+    """
+
+    __slots__ = ('func', 'count', 'total', 'value')
+
+    def __init__(self, func):
+        self.func = func
+        self.count = 0
+        self.total = 0
+        self.value = None
+
+    def add(self, row, field):
+        if field is None:
+            self.count += 1
+            return
+
+        value = row.get(field)
+        if value is None:
+            return
+        values = value if isinstance(value, list) else (value,)
+        if not values:
+            return
+
+        self.count += len(values)
+        func = self.func
+        try:
+            if func == 'avg' or func == 'sum':
+                self.total += sum(values)
+            elif func == 'min':
+                low = min(values)
+                if self.value is None or low < self.value:
+                    self.value = low
+            elif func == 'max':
+                high = max(values)
+                if self.value is None or high > self.value:
+                    self.value = high
+        except TypeError:
+            raise ValueError(f"Cannot compute {func} of field '{field}'")
+
+    def result(self):
+        if self.func == 'count':
+            return self.count
+        if self.count == 0:
+            return None
+        if self.func == 'avg':
+            return self.total / self.count
+        if self.func == 'sum':
+            return self.total
+        return self.value
+
+
+_KEYWORDS = ('join', 'where', 'and', 'group', 'sort', 'limit') + AGGREGATES
+
+
+def _parse_value(token):
+    """Convert a token to an int or float when it looks like a number."""
+    for convert in (int, float):
+        try:
+            return convert(token)
+        except ValueError:
+            pass
+    return token
+
+
+def parse(expression, data, indexes=None):
+    """
+    Parse a query expression into a Query.
+
+    Args:
+        expression: Query text, see the module docstring
+        data: Dictionary with students, courses and enrollments lists
+        indexes: Indexes to reuse between queries (optional)
+
+    Returns: The Query object
+
+    Raises a ValueError if the expression is invalid
+    """
+    tokens = shlex.split(expression)
+    if not tokens:
+        raise ValueError("Query is empty")
+
+    query = Query(data, tokens[0], indexes)
+    pos = 1
+
+    def take(what):
+        nonlocal pos
+        if pos >= len(tokens):
+            raise ValueError(f"Expected {what} at end of query")
+        pos += 1
+        return tokens[pos - 1]
+
+    while pos < len(tokens):
+        word = take("a clause").lower()
+        if word == 'join':
+            query.join(take("a table"))
+        elif word in ('where', 'and'):
+            field = take("a field")
+            op = take("an operator")
+            query.where(field, op, _parse_value(take("a value")))
+        elif word == 'group':
+            if take("'by'").lower() != 'by':
+                raise ValueError("Expected 'by' after 'group'")
+            query.group_by(take("a field"))
+        elif word in AGGREGATES:
+            field = None
+            if word != 'count' or (pos < len(tokens) and
+                                   tokens[pos].lower() not in _KEYWORDS):
+                field = take("a field")
+            query.aggregate(word, field)
+        elif word == 'sort':
+            field = take("a field")
+            desc = pos < len(tokens) and tokens[pos].lower() in ('desc', 'asc')
+            if desc:
+                desc = take("a direction").lower() == 'desc'
+            query.sort(field, desc)
+        elif word == 'limit':
+            try:
+                query.limit(int(take("a number")))
+            except ValueError:
+                raise ValueError("limit must be a number")
+        else:
+            raise ValueError(f"Unexpected '{word}' in query")
+
+    return query
+
+
+def run_query(expression, data, indexes=None):
+    """Parse and run a query expression. Returns the list of result rows."""
+    return parse(expression, data, indexes).run()
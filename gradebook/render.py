@@ -0,0 +1,171 @@
+"""
+Rendering of list output and reports.
+
+Rows are rendered in batches and written to the output with one write
+call per batch instead of one print per row. Supported formats:
+
+    text:   the original "Key: value, Key: value" lines of main.py list
+    csv:    comma separated values with a header row
+    jsonl:  one JSON object per line
+    table:  columns aligned to the widest value
+
+Also contains ReportCache, which keeps rendered per-course reports until
+that course's enrollments change.
+"""
+
+import csv
+import io
+import json
+import threading
+from operator import itemgetter
+
+FORMATS = ('text', 'csv', 'jsonl', 'table')
+BATCH_SIZE = 5000
+
+
+def format_value(value):
+    """Format a value for text, csv and table output."""
+    if type(value) is str:
+        return value
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _batches(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _value_getter(keys):
+    """
+    Return a function mapping a row to the tuple of its column values.
+
+    Uses itemgetter for speed and falls back to dict.get for rows that
+    are missing a column.
+    """
+    getter = itemgetter(*keys)
+    single = len(keys) == 1
+
+    def values(row):
+        try:
+            result = getter(row)
+        except KeyError:
+            return tuple(row.get(key) for key in keys)
+        return (result,) if single else result
+
+    return values
+
+
+def render(rows, columns, fmt, out):
+    """
+    Write rows to out in the given format.
+
+    Args:
+        rows: Iterable of dictionaries
+        columns: List of (header, key) tuples
+        fmt: One of FORMATS
+        out: Writable text file, such as sys.stdout
+
+    Returns: Number of rows written
+
+    Raises a ValueError for an unknown format
+    """
+    if fmt not in FORMATS:
+        raise ValueError(
+            f"Unknown format '{fmt}', expected one of {', '.join(FORMATS)}")
+    if not columns:
+        return 0
+
+    headers = [header for header, _ in columns]
+    keys = [key for _, key in columns]
+    values = _value_getter(keys)
+    count = 0
+
+    if fmt == 'table':
+        # Column widths need every row, so the table is built in one go
+        cells = [tuple(map(format_value, values(row))) for row in rows]
+        widths = [max([len(h)] + [len(c[i]) for c in cells])
+                  for i, h in enumerate(headers)]
+        template = "  ".join("{:<%d}" % w for w in widths)
+        out.write(template.format(*headers).rstrip() + "\n" +
+                  "  ".join("-" * w for w in widths) + "\n")
+        for batch in _batches(cells):
+            out.write("".join(template.format(*c).rstrip() + "\n"
+                              for c in batch))
+        return len(cells)
+
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(headers)
+        for batch in _batches(rows):
+            writer.writerows(map(format_value, values(row)) for row in batch)
+            out.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            count += len(batch)
+        out.write(buffer.getvalue())
+        return count
+
+    if fmt == 'jsonl':
+        encode = json.JSONEncoder().encode
+        for batch in _batches(rows):
+            out.write("".join(encode(dict(zip(keys, values(row)))) + "\n"
+                              for row in batch))
+            count += len(batch)
+        return count
+
+    template = ", ".join(h.replace("{", "{{").replace("}", "}}") + ": {}"
+                         for h in headers) + "\n"
+    for batch in _batches(rows):
+        out.write("".join(template.format(*map(format_value, values(row)))
+                          for row in batch))
+        count += len(batch)
+    return count
+
+
+def render_to_string(rows, columns, fmt):
+    """Render rows and return the output as a string."""
+    buffer = io.StringIO()
+    render(rows, columns, fmt, buffer)
+    return buffer.getvalue()
+
+
+class ReportCache:
+    """
+    Cache of rendered reports keyed by course code and format.
+
+    Each entry stores the course version it was rendered for; the owner
+    bumps a course's version whenever its enrollments change, which
+    makes the old entries stale.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, course_code, fmt, version):
+        """Return the cached report, or None if missing or stale."""
+        with self._lock:
+            entry = self._entries.get((course_code, fmt))
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, course_code, fmt, version, text):
+        """Store a rendered report for a course version."""
+        with self._lock:
+            self._entries[(course_code, fmt)] = (version, text)
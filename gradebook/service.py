@@ -1,10 +1,21 @@
 """
 Service layer for gradebook operations.
 Contains business logic for managing students, courses, enrollments, and grades.
+
+The module-level functions reload and rewrite the data file on every call.
+The Gradebook class keeps the data in memory and can be shared by threads.
 """
 
+import json
+import threading
+
 from gradebook.models import Student, Course, Enrollment
 from .storage import load_data, save_data
+from .validation import validate_student_name, validate_grade
+from .locks import RWLock
+from .maintenance import BackgroundFlusher
+from .query import Indexes, run_query
+from .render import ReportCache, render_to_string
 
 
 def add_student(name):
@@ -14,7 +25,10 @@ def add_student(name):
     Args: name: Student name as a string
 
     Returns: The new student ID
+
+    Raises a ValueError if the name is empty
     """
+    name = validate_student_name(name)
     data = load_data()
 
     if data["students"]:
@@ -22,7 +36,7 @@ def add_student(name):
     else:
         new_id = 1
 
-    data["students"].append({"id": new_id, "name": name.strip()})
+    data["students"].append({"id": new_id, "name": name})
 
     save_data(data)
 
@@ -40,15 +54,16 @@ def add_course(code, title):
 
     Returns: The new Course object
 
-    Raises a ValueError if course code already exists
+    Raises a ValueError if course code already exists or is invalid
     """
+    new_course = Course(code, title)
+
     data = load_data()
 
     for course in data['courses']:
-        if course['code'] == code:
-            raise ValueError(f"Course with code {code} already exists")
-
-    new_course = Course(code, title)
+        if course['code'] == new_course.code:
+            raise ValueError(
+                f"Course with code {new_course.code} already exists")
 
     data['courses'].append({
         'code': new_course.code,
@@ -84,7 +99,7 @@ def enroll(student_id, course_code):
         print(f"Student {student_id} is already enrolled in {course_code}.")
         return
 
-    new_enrollment = Enrollment(student_id, course_code, [])
+    new_enrollment = Enrollment(student_id, course_code, [], trusted=True)
 
     data['enrollments'].append({
         'student_id': new_enrollment.student_id,
@@ -112,14 +127,10 @@ def add_grade(student_id, course_code, grade):
         ValueError: If grade is not between 0 and 100
         ValueError: If enrollment not found
     """
+    validate_grade(grade)
 
     data = load_data()
 
-    if not isinstance(grade, (int, float)):
-        raise TypeError("Grade must be a number.")
-    if not (0 <= grade <= 100):
-        raise ValueError("Grade must be between 0 and 100.")
-
     for enrollment in data['enrollments']:
         if enrollment['student_id'] == student_id and enrollment['course_code'] == course_code:
             enrollment['grades'].append(grade)
@@ -211,3 +222,429 @@ def compute_gpa(student_id):
         return 0.0
 
     return sum(course_averages) / len(course_averages)
+
+
+REPORT_COLUMNS = [("Student ID", 'student_id'), ("Name", 'name'),
+                  ("Grades", 'grades'), ("Average", 'average')]
+UNKNOWN_STUDENT = "(unknown student)"
+
+
+def _record_size(record):
+    """Return the size of a record as compact JSON, plus its separator."""
+    return len(json.dumps(record, separators=(',', ':'))) + 1
+
+
+class Gradebook:
+    """
+    In-process gradebook that is safe to share between threads.
+
+    Holds its storage path and the loaded data, with dictionary indexes
+    for students, courses and enrollments. Reads (list_*, compute_*) run
+    concurrently under a shared lock, writes are serialized and flushed
+    to disk in batches of flush_every mutations, or every flush_interval
+    seconds by a background thread.
+
+    Unlike the module-level functions, methods do not print and report
+    failures by raising ValueError. If a flush fails to write the file,
+    the method that triggered it raises OSError; the change is kept in
+    memory and written by the next successful flush.
+
+    Attributes:
+        path: Path to the JSON data file
+        flush_every: Number of mutations to batch before writing the file
+        generations: Number of snapshot generations kept on each flush
+    """
+
+    def __init__(self, path='data/gradebook.json', flush_every=1, verify=False,
+                 flush_interval=None, generations=0):
+        """
+        Load the gradebook from path.
+
+        Args:
+            path: Path to the JSON file (default: 'data/gradebook.json')
+            flush_every: Mutations to batch before each save (default: 1)
+            verify: Run the integrity scan while loading
+            flush_interval: Seconds between background flushes (default: off)
+            generations: Snapshot generations to keep (default: 0)
+        """
+        if flush_every < 1:
+            raise ValueError("flush_every must be at least 1")
+
+        self.path = path
+        self.flush_every = flush_every
+        self.generations = generations
+        self._lock = RWLock()
+        self._flush_lock = threading.Lock()
+        self._pending = 0
+        self._mutations = 0
+        self._logical_bytes = 0
+        self._flushes = 0
+        self._bytes_written = 0
+        self._data = load_data(path, verify=verify)
+        self._build_indexes()
+        self._query_indexes = None
+        self._course_versions = {}
+        self._reports = ReportCache()
+
+        self._flusher = None
+        if flush_interval:
+            self._flusher = BackgroundFlusher(self, flush_interval)
+            self._flusher.start()
+
+    def _build_indexes(self):
+        """Index the loaded records by their keys."""
+        self._students = {s['id']: s for s in self._data['students']}
+        self._courses = {c['code']: c for c in self._data['courses']}
+        self._enrollments = {}
+        self._by_student = {}
+        self._by_course = {}
+        for e in self._data['enrollments']:
+            self._enrollments[(e['student_id'], e['course_code'])] = e
+            self._by_student.setdefault(e['student_id'], []).append(e)
+            self._by_course.setdefault(e['course_code'], []).append(e)
+
+    def _course_changed(self, course_code):
+        """Invalidate cached reports of a course. Needs the write lock."""
+        self._course_versions[course_code] = \
+            self._course_versions.get(course_code, 0) + 1
+
+    def _mutated(self, size, count=1):
+        """
+        Count mutations. Must be called while holding the write lock.
+
+        Args:
+            size: Bytes of JSON the mutations add to the file
+            count: Number of mutations (default: 1)
+
+        Returns: True if the batch is full and should be flushed
+        """
+        self._pending += count
+        self._mutations += count
+        self._query_indexes = None
+        self._logical_bytes += size
+        return self._pending >= self.flush_every
+
+    def flush(self):
+        """
+        Write pending mutations to disk.
+
+        Holds the read lock while saving, so readers keep running and
+        writers wait until the file has been written.
+
+        Raises an OSError if the file could not be written. The
+        mutations stay pending, so the next flush retries them.
+        """
+        with self._flush_lock:
+            with self._lock.read():
+                if self._pending == 0:
+                    return
+                written = save_data(self._data, self.path, verbose=False,
+                                    generations=self.generations)
+                if written == 0:
+                    raise OSError(
+                        f"Could not save gradebook to '{self.path}', "
+                        f"{self._pending} mutation(s) still pending")
+                self._pending = 0
+                self._flushes += 1
+                self._bytes_written += written
+
+    def close(self):
+        """Stop the background flusher and flush any pending mutations."""
+        if self._flusher is not None:
+            self._flusher.stop()
+            self._flusher = None
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def pending(self):
+        """Number of mutations not yet written to disk."""
+        return self._pending
+
+    def stats(self):
+        """
+        Get write statistics since the gradebook was opened.
+
+        Returns:
+            Dictionary with mutations, logical_bytes (JSON added by the
+            mutations), flushes, bytes_written and write_amplification
+            (bytes_written / logical_bytes)
+        """
+        with self._lock.read():
+            logical = self._logical_bytes
+            written = self._bytes_written
+            return {
+                'mutations': self._mutations,
+                'logical_bytes': logical,
+                'flushes': self._flushes,
+                'bytes_written': written,
+                'write_amplification': written / logical if logical else 0.0
+            }
+
+    def add_student(self, name):
+        """
+        Add a new student.
+
+        Args: name: Student name as a string
+
+        Returns: The new student ID
+
+        Raises a ValueError if the name is empty
+        """
+        name = validate_student_name(name)
+        with self._lock.write():
+            new_id = max(self._students, default=0) + 1
+            record = {"id": new_id, "name": name}
+            self._data['students'].append(record)
+            self._students[new_id] = record
+            full = self._mutated(_record_size(record))
+        if full:
+            self.flush()
+        return new_id
+
+    def add_course(self, code, title):
+        """
+        Add a new course.
+
+        Args:
+            code: Course code (e.g., 'CS101')
+            title: Course title
+
+        Returns: The new Course object
+
+        Raises a ValueError if course code already exists or is invalid
+        """
+        new_course = Course(code, title)
+        with self._lock.write():
+            if new_course.code in self._courses:
+                raise ValueError(
+                    f"Course with code {new_course.code} already exists")
+            record = {'code': new_course.code, 'title': new_course.title}
+            self._data['courses'].append(record)
+            self._courses[new_course.code] = record
+            full = self._mutated(_record_size(record))
+        if full:
+            self.flush()
+        return new_course
+
+    def enroll(self, student_id, course_code):
+        """
+        Enroll a student in a course.
+
+        Args:
+            student_id: Student ID number
+            course_code: Course code (e.g., 'CS101')
+
+        Returns: The new Enrollment object
+
+        Raises a ValueError if the student or course does not exist,
+        or the student is already enrolled
+        """
+        with self._lock.write():
+            if student_id not in self._students:
+                raise ValueError(f"No student found with ID {student_id}.")
+            if course_code not in self._courses:
+                raise ValueError(f"No course found with code '{course_code}'.")
+            key = (student_id, course_code)
+            if key in self._enrollments:
+                raise ValueError(
+                    f"Student {student_id} is already enrolled in {course_code}.")
+
+            new_enrollment = Enrollment(
+                student_id, course_code, [], trusted=True)
+            record = {
+                'student_id': student_id,
+                'course_code': course_code,
+                'grades': []
+            }
+            self._data['enrollments'].append(record)
+            self._enrollments[key] = record
+            self._by_student.setdefault(student_id, []).append(record)
+            self._by_course.setdefault(course_code, []).append(record)
+            self._course_changed(course_code)
+            full = self._mutated(_record_size(record))
+        if full:
+            self.flush()
+        return new_enrollment
+
+    def add_grade(self, student_id, course_code, grade):
+        """
+        Add a grade for a student in a course.
+
+        Args:
+            student_id: Student ID number
+            course_code: Course code
+            grade: Grade value (0-100)
+
+        Raises:
+            TypeError: If grade is not a number
+            ValueError: If grade is not between 0 and 100
+            ValueError: If enrollment not found
+        """
+        validate_grade(grade)
+        with self._lock.write():
+            enrollment = self._enrollments.get((student_id, course_code))
+            if enrollment is None:
+                raise ValueError(
+                    f"Enrollment not found for student {student_id} in course {course_code}")
+            enrollment['grades'].append(grade)
+            self._course_changed(course_code)
+            full = self._mutated(len(str(grade)) + 1)
+        if full:
+            self.flush()
+
+    def add_grades(self, rows):
+        """
+        Add many already validated grades under a single write lock.
+
+        Used by bulk paths such as the ingestion pipeline. Grades are not
+        checked again, so callers must validate them first.
+
+        Args:
+            rows: Iterable of (student_id, course_code, grade, ...) tuples,
+                extra items (such as a line number) are ignored
+
+        Returns: List of rows whose enrollment was not found
+        """
+        missing = []
+        changed = set()
+        added = 0
+        size = 0
+        with self._lock.write():
+            enrollments = self._enrollments
+            for row in rows:
+                enrollment = enrollments.get((row[0], row[1]))
+                if enrollment is None:
+                    missing.append(row)
+                    continue
+                enrollment['grades'].append(row[2])
+                changed.add(row[1])
+                added += 1
+                size += len(str(row[2])) + 1
+            for course_code in changed:
+                self._course_changed(course_code)
+            full = added and self._mutated(size, added)
+        if full:
+            self.flush()
+        return missing
+
+    def query(self, expression):
+        """
+        Run a query expression (see gradebook.query) on the current data.
+
+        Query indexes are kept between calls until the next mutation.
+
+        Returns: List of result rows
+
+        Raises a ValueError if the expression is invalid
+        """
+        with self._lock.read():
+            indexes = self._query_indexes
+            if indexes is None:
+                indexes = self._query_indexes = Indexes(self._data)
+            return run_query(expression, self._data, indexes)
+
+    def course_report(self, course_code, fmt='table'):
+        """
+        Render the enrollments of a course with student names and averages.
+
+        Reports are cached per course and format, and only re-rendered
+        after that course's enrollments or grades change.
+
+        Args:
+            course_code: Course code
+            fmt: Output format, see gradebook.render.FORMATS
+
+        Returns: The rendered report as a string
+
+        Raises a ValueError if the course does not exist
+        """
+        with self._lock.read():
+            if course_code not in self._courses:
+                raise ValueError(f"No course found with code '{course_code}'.")
+            version = self._course_versions.get(course_code, 0)
+            report = self._reports.get(course_code, fmt, version)
+            if report is not None:
+                return report
+
+            rows = []
+            for e in sorted(self._by_course.get(course_code, []),
+                            key=lambda e: e['student_id']):
+                grades = e['grades']
+                # Files loaded without verify may have dangling enrollments
+                student = self._students.get(e['student_id'])
+                rows.append({
+                    'student_id': e['student_id'],
+                    'name': student['name'] if student else UNKNOWN_STUDENT,
+                    'grades': list(grades),
+                    'average': round(sum(grades) / len(grades), 2) if grades else None
+                })
+
+        report = render_to_string(rows, REPORT_COLUMNS, fmt)
+        self._reports.put(course_code, fmt, version, report)
+        return report
+
+    def list_students(self):
+        """Get a sorted list of all students."""
+        with self._lock.read():
+            return sorted((dict(s) for s in self._data['students']),
+                          key=lambda s: s["name"].lower())
+
+    def list_courses(self):
+        """Get a sorted list of all courses."""
+        with self._lock.read():
+            return sorted((dict(c) for c in self._data['courses']),
+                          key=lambda c: c["code"].lower())
+
+    def list_enrollments(self):
+        """Get a sorted list of all enrollments."""
+        with self._lock.read():
+            enrollments = [{'student_id': e['student_id'],
+                            'course_code': e['course_code'],
+                            'grades': list(e['grades'])}
+                           for e in self._data['enrollments']]
+        return sorted(enrollments, key=lambda e: (e["student_id"], e["course_code"]))
+
+    def compute_average(self, student_id, course_code):
+        """
+        Compute the average grade for a student in a course.
+
+        Returns: Average grade as a float, or 0.0 if no grades
+
+        Raises: ValueError: If enrollment not found
+        """
+        with self._lock.read():
+            enrollment = self._enrollments.get((student_id, course_code))
+            if enrollment is None:
+                raise ValueError(
+                    f"Enrollment not found for student {student_id} in course {course_code}")
+            grades = enrollment['grades']
+            if not grades:
+                return 0.0
+            return sum(grades) / len(grades)
+
+    def compute_gpa(self, student_id):
+        """
+        Compute the GPA for a student across all courses.
+
+        Returns: GPA as a float, or 0.0 if no grades
+
+        Raises: ValueError: If student not found
+        """
+        with self._lock.read():
+            if student_id not in self._students:
+                raise ValueError(f"Student {student_id} not found")
+
+            course_averages = [sum(e['grades']) / len(e['grades'])
+                               for e in self._by_student.get(student_id, [])
+                               if e['grades']]
+
+        if not course_averages:
+            return 0.0
+
+        return sum(course_averages) / len(course_averages)
@@ -2,23 +2,76 @@
 Storage layer for gradebook data persistence.
 
 Handles loading and saving gradebook data to/from JSON files.
+
+Saves are atomic (written to a temporary file, then renamed) and can keep
+rolling snapshot generations of the previous file (path.1 is the newest,
+path.N the oldest). If the data file is corrupted, load_data falls back
+to the newest readable snapshot.
 """
 
 import json
 import os
 import logging
+import shutil
+
+from .validation import check_integrity
+
+def snapshot_path(path, generation):
+    """Return the file name of a snapshot generation (1 is the newest)."""
+    return f"{path}.{generation}"
+
 
+def _rotate_snapshots(path, generations):
+    """
+    Shift path.1..path.N up by one and keep the current file as path.1.
 
-def load_data(path='data/gradebook.json'):
+    The current file is hard-linked rather than moved, so path exists
+    at every moment even if the process crashes during a save.
+    """
+    oldest = snapshot_path(path, generations)
+    if os.path.exists(oldest):
+        os.remove(oldest)
+    for generation in range(generations - 1, 0, -1):
+        current = snapshot_path(path, generation)
+        if os.path.exists(current):
+            os.replace(current, snapshot_path(path, generation + 1))
+    if os.path.exists(path):
+        try:
+            os.link(path, snapshot_path(path, 1))
+        except OSError:
+            shutil.copyfile(path, snapshot_path(path, 1))
+
+
+def _load_from_snapshot(path):
+    """Return data from the newest readable snapshot of path, or None."""
+    generation = 1
+    while os.path.exists(snapshot_path(path, generation)):
+        candidate = snapshot_path(path, generation)
+        try:
+            with open(candidate, "r") as f:
+                data = json.load(f)
+            logging.warning("Recovered data from snapshot " + candidate)
+            return data
+        except json.JSONDecodeError:
+            logging.error("Snapshot " + candidate + " is also corrupted")
+        generation += 1
+    return None
+
+
+def load_data(path='data/gradebook.json', verify=False):
     """
     Load gradebook data from a JSON file.
 
-    Args: path: Path to the JSON file (default: 'data/gradebook.json')
+    Args:
+        path: Path to the JSON file (default: 'data/gradebook.json')
+        verify: Run the integrity scan on the loaded data
 
     Returns:
         Dictionary containing students, courses, and enrollments lists.
         Returns empty structure if file doesn't exist.
 
+    Raises a ValueError if verify is set and the data has integrity problems
+
     Logs loading attempts and results to logs/app.log
     """
 
@@ -32,35 +85,69 @@ def load_data(path='data/gradebook.json'):
         with open(path, "r") as f:
             data = json.load(f)
         logging.info("Successfully loaded data from " + path)
-        return data
-
     except json.JSONDecodeError:
         logging.error("Could not read JSON in '" +
                       path + "', file might be corrupted")
-        print(f"Could not read JSON in '{path}', file might be corrupted.")
-        return {'students': [], 'courses': [], 'enrollments': []}
-
-
-def save_data(data, path='data/gradebook.json'):
+        data = _load_from_snapshot(path)
+        if data is None:
+            print(f"Could not read JSON in '{path}', file might be corrupted.")
+            return {'students': [], 'courses': [], 'enrollments': []}
+        print(f"Could not read JSON in '{path}', recovered from snapshot.")
+
+    if verify:
+        problems = check_integrity(data)
+        for problem in problems:
+            logging.error("Integrity problem in " + path + ": " + problem)
+        if problems:
+            raise ValueError(
+                f"Integrity check failed for '{path}': {len(problems)} problem(s), "
+                f"first: {problems[0]}")
+
+    return data
+
+
+def save_data(data, path='data/gradebook.json', verbose=True,
+              compact=True, generations=0):
     """
     Save gradebook data to a JSON file.
 
     Args:
         data: Dictionary containing students, courses, and enrollments
         path: Path to the JSON file (default: 'data/gradebook.json')
+        verbose: Print the result to the console
+        compact: Write JSON without indentation (default: True)
+        generations: Number of previous versions to keep as snapshots
+
+    Returns: Number of bytes written, or 0 if saving failed
 
     Creates parent directories if they don't exist.
     Logs save attempts and results to logs/app.log
     """
     logging.info("Attempting to save data to " + path)
     try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if compact:
+            text = json.dumps(data, separators=(',', ':'))
+        else:
+            text = json.dumps(data, indent=2)
+        encoded = text.encode("utf-8")
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(encoded)
+        if generations > 0:
+            _rotate_snapshots(path, generations)
+        os.replace(tmp_path, path)
 
         logging.info("Data successfully saved to " + path)
-        print(f"Data successfully saved to '{path}'.")
+        if verbose:
+            print(f"Data successfully saved to '{path}'.")
+        return len(encoded)
     except OSError as e:
         logging.error("Error saving data to '" + path + "': " + str(e))
-        print(f"Error saving data to '{path}': {e}")
+        if verbose:
+            print(f"Error saving data to '{path}': {e}")
+        return 0
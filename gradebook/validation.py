@@ -0,0 +1,192 @@
+"""
+Validation layer for gradebook data.
+
+All input checks live here so each record is validated once, at the
+boundary where it enters the gradebook. The CLI, the models and the
+service layer share these functions instead of repeating their own checks.
+
+Also contains check_integrity, a single pass over a loaded data file
+that reports dangling enrollments, duplicate ids and bad grades.
+"""
+
+_NUMBER = (int, float)
+
+
+def validate_student_name(name):
+    """Return the stripped name, or raise ValueError if it is empty."""
+    if not isinstance(name, str) or name.strip() == "":
+        raise ValueError("Student name cannot be empty")
+    return name.strip()
+
+
+def validate_course_code(code):
+    """Return the stripped course code, or raise ValueError if invalid."""
+    if not isinstance(code, str) or code.strip() == "":
+        raise ValueError("Course code cannot be empty")
+    code = code.strip()
+    if len(code) < 2:
+        raise ValueError("Course code must be at least 2 characters long")
+    return code
+
+
+def validate_course_title(title):
+    """Return the stripped course title, or raise ValueError if empty."""
+    if not isinstance(title, str) or title.strip() == "":
+        raise ValueError("Course title cannot be empty")
+    return title.strip()
+
+
+def validate_student_id(student_id):
+    """
+    Convert a student ID from user input to a positive int.
+
+    Raises a ValueError if it is not a number or not positive
+    """
+    try:
+        id_value = int(student_id)
+    except (TypeError, ValueError):
+        raise ValueError("Student ID must be a number")
+
+    if id_value <= 0:
+        raise ValueError("Student ID must be positive")
+
+    return id_value
+
+
+def parse_grade(grade):
+    """
+    Convert a grade from user input (usually a string) to a float.
+
+    Only converts; the range is checked by validate_grade where the
+    grade enters the gradebook, so it is checked once.
+
+    Raises a ValueError if it is not a number
+    """
+    try:
+        return float(grade)
+    except (TypeError, ValueError):
+        raise ValueError("Grade must be a number")
+
+
+def validate_grade(grade):
+    """
+    Check a single numeric grade.
+
+    Raises:
+        TypeError: If grade is not a number
+        ValueError: If grade is not between 0 and 100
+    """
+    if not isinstance(grade, _NUMBER):
+        raise TypeError("Grade must be a number.")
+    # Also rejects NaN and infinity
+    if not (0 <= grade <= 100):
+        raise ValueError("Grade must be between 0 and 100.")
+    return grade
+
+
+def validate_grades(grades):
+    """
+    Check a whole list of grades in one call.
+
+    A single loop with a type check and a chained range comparison per
+    grade, which also rejects NaN. Builtin passes (map/min/max) only beat
+    it for lists of about 100 grades, and enrollments hold a handful.
+
+    Raises:
+        TypeError: If grades is not a list or contains non-numeric values
+        ValueError: If any grade is not between 0 and 100
+    """
+    if not isinstance(grades, list):
+        raise TypeError(
+            "Grades must be provided as a list, e.g., [80, 90, 100].")
+    for grade in grades:
+        if not isinstance(grade, _NUMBER):
+            raise TypeError("Each grade must be a number.")
+        if not (0 <= grade <= 100):
+            raise ValueError("Each grade must be between 0 and 100.")
+    return grades
+
+
+def _records(data, key, problems):
+    """Return data[key] as a list of dictionaries, reporting bad records."""
+    records = data.get(key, [])
+    if not isinstance(records, list):
+        problems.append(f"'{key}' must be a list")
+        return []
+    valid = []
+    for position, record in enumerate(records):
+        if isinstance(record, dict):
+            valid.append(record)
+        else:
+            problems.append(f"Record {position} in '{key}' is not an object")
+    return valid
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def check_integrity(data):
+    """
+    Scan loaded gradebook data once and collect every problem found.
+
+    Malformed data (records that are not objects, missing or invalid
+    ids) is reported as a problem rather than raising.
+
+    Args: data: Dictionary with students, courses and enrollments lists
+
+    Returns: List of problem descriptions (empty if the data is valid)
+    """
+    if not isinstance(data, dict):
+        return ["Data must be a JSON object"]
+    problems = []
+
+    student_ids = set()
+    for student in _records(data, 'students', problems):
+        student_id = student.get('id')
+        if not _is_id(student_id):
+            problems.append(f"Student has an invalid id {student_id!r}")
+            continue
+        if student_id in student_ids:
+            problems.append(f"Duplicate student id {student_id}")
+        student_ids.add(student_id)
+
+    course_codes = set()
+    for course in _records(data, 'courses', problems):
+        code = course.get('code')
+        if not isinstance(code, str):
+            problems.append(f"Course has an invalid code {code!r}")
+            continue
+        if code in course_codes:
+            problems.append(f"Duplicate course code {code}")
+        course_codes.add(code)
+
+    seen = set()
+    for enrollment in _records(data, 'enrollments', problems):
+        student_id = enrollment.get('student_id')
+        course_code = enrollment.get('course_code')
+        if not _is_id(student_id) or not isinstance(course_code, str):
+            problems.append(f"Enrollment has an invalid student_id "
+                            f"{student_id!r} or course_code {course_code!r}")
+            continue
+        key = (student_id, course_code)
+
+        if key in seen:
+            problems.append(
+                f"Duplicate enrollment for student {student_id} in {course_code}")
+        seen.add(key)
+
+        if student_id not in student_ids:
+            problems.append(
+                f"Enrollment references unknown student {student_id}")
+        if course_code not in course_codes:
+            problems.append(
+                f"Enrollment references unknown course {course_code}")
+
+        try:
+            validate_grades(enrollment.get('grades'))
+        except (TypeError, ValueError) as e:
+            problems.append(
+                f"Bad grades for student {student_id} in {course_code}: {e}")
+
+    return problems
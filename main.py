@@ -3,6 +3,16 @@ import sys
 import os
 import gradebook.service as service
 import logging
+from gradebook.storage import load_data
+import gradebook.maintenance as maintenance
+from gradebook.query import run_query
+from gradebook.ingest import ingest
+from gradebook.render import FORMATS, render, format_value
+from gradebook.paged import PagedGradebook, convert, parse_size
+import itertools
+import time
+from gradebook.validation import (validate_course_code, parse_grade,
+                                  validate_student_id, check_integrity)
 
 log_dir = 'logs'
 if not os.path.exists(log_dir):
@@ -15,53 +25,34 @@ logging.basicConfig(
 )
 
 
-def validate_student_name(name):
-    if not name or name.strip() == "":
-        raise ValueError("Student name cannot be empty")
-    return name.strip()
+# Commands that can run against a paged gradebook directory
+PAGED_COMMANDS = ('add-student', 'add-course', 'enroll', 'add-grade',
+                  'list', 'avg', 'gpa')
 
 
-def validate_course_code(code):
-    if not code or code.strip() == "":
-        raise ValueError("Course code cannot be empty")
-    code = code.strip()
-    if len(code) < 2:
-        raise ValueError("Course code must be at least 2 characters long")
-    return code
+def write_output(rows, columns, fmt, output=None, header=None):
+    """
+    Render rows to the output file, or to stdout if none is given.
 
-
-def validate_course_title(title):
-    if not title or title.strip() == "":
-        raise ValueError("Course title cannot be empty")
-    return title.strip()
-
-
-def parse_grade(grade):
-    try:
-        grade_value = float(grade)
-    except ValueError:
-        raise ValueError("Grade must be a number")
-
-    if grade_value < 0 or grade_value > 100:
-        raise ValueError("Grade must be between 0 and 100")
-
-    return grade_value
-
-
-def validate_student_id(student_id):
-    try:
-        id_value = int(student_id)
-    except ValueError:
-        raise ValueError("Student ID must be a number")
-
-    if id_value <= 0:
-        raise ValueError("Student ID must be positive")
-
-    return id_value
+    An optional header line is written to the same output first.
+    """
+    if output:
+        with open(output, "w", encoding="utf-8", newline="") as f:
+            if header is not None:
+                f.write(header + "\n")
+            render(rows, columns, fmt, f)
+    else:
+        if header is not None:
+            sys.stdout.write(header + "\n")
+        render(rows, columns, fmt, sys.stdout)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Gradebook CLI')
+    parser.add_argument('--paged', metavar='DIR',
+                        help='use a paged gradebook directory (see paginate)')
+    parser.add_argument('--max-memory', default='64MB',
+                        help='page cache budget in paged mode, e.g. 256MB')
     subparsers = parser.add_subparsers(dest='command')
 
     # add-student command
@@ -89,6 +80,15 @@ def main():
     list_parser.add_argument(
         'type', choices=['students', 'courses', 'enrollments'])
     list_parser.add_argument('--sort', choices=['name', 'code'])
+    list_parser.add_argument('--format', choices=FORMATS, default='text')
+    list_parser.add_argument('--output')
+
+    # report command
+    report_parser = subparsers.add_parser('report')
+    report_parser.add_argument('--course', required=True)
+    report_parser.add_argument('--format', choices=FORMATS, default='table')
+    report_parser.add_argument('--output')
+    report_parser.add_argument('--path', default='data/gradebook.json')
 
     # avg command
     avg_parser = subparsers.add_parser('avg')
@@ -99,85 +99,122 @@ def main():
     gpa_parser = subparsers.add_parser('gpa')
     gpa_parser.add_argument('--student-id', required=True)
 
+    # check command
+    check_parser = subparsers.add_parser('check')
+    check_parser.add_argument('--path', default='data/gradebook.json')
+
+    # query command
+    query_parser = subparsers.add_parser('query')
+    query_parser.add_argument('expression')
+    query_parser.add_argument('--path', default='data/gradebook.json')
+    query_parser.add_argument('--format', choices=FORMATS, default='text')
+    query_parser.add_argument('--output')
+
+    # ingest command
+    ingest_parser = subparsers.add_parser('ingest')
+    ingest_parser.add_argument('file')
+    ingest_parser.add_argument('--workers', type=int, default=0)
+    ingest_parser.add_argument('--chunk-size', type=int, default=10000)
+    ingest_parser.add_argument('--path', default='data/gradebook.json')
+
+    # maintenance command
+    maintenance_parser = subparsers.add_parser('maintenance')
+    maintenance_parser.add_argument('--path', default='data/gradebook.json')
+    maintenance_parser.add_argument('--compact', action='store_true')
+    maintenance_parser.add_argument('--verify', action='store_true')
+    maintenance_parser.add_argument('--generations', type=int, default=0)
+    maintenance_parser.add_argument('--flush-every', type=int, nargs='+',
+                                    default=[1, 10, 100, 1000, 10000])
+
+    # paginate command
+    paginate_parser = subparsers.add_parser('paginate')
+    paginate_parser.add_argument('--path', default='data/gradebook.json')
+    paginate_parser.add_argument('--output', required=True)
+    paginate_parser.add_argument('--page-size', type=int, default=1024)
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
+    if args.paged and args.command not in PAGED_COMMANDS:
+        parser.error("--paged is not supported by '" + args.command +
+                     "', only by " + ", ".join(PAGED_COMMANDS))
+
     try:
+        # Paged mode keeps the data on disk and only caches some pages
+        backend = service
+        if args.paged:
+            backend = PagedGradebook(args.paged, parse_size(args.max_memory))
+
         if args.command == 'add-student':
-            validated_name = validate_student_name(args.name)
-            logging.info("Adding student: " + validated_name)
-            service.add_student(validated_name)
+            logging.info("Adding student: " + args.name)
+            student_id = backend.add_student(args.name)
+            if args.paged:
+                print("Student '" + args.name.strip() +
+                      "' added with ID " + str(student_id) + ".")
 
         elif args.command == 'add-course':
-            validated_code = validate_course_code(args.code)
-            validated_title = validate_course_title(args.title)
-            logging.info("Adding course: " + validated_code +
-                         " - " + validated_title)
-            service.add_course(validated_code, validated_title)
+            logging.info("Adding course: " + args.code + " - " + args.title)
+            course = backend.add_course(args.code, args.title)
+            if args.paged:
+                print("Course '" + course.title + "' - " +
+                      course.code + " added successfully.")
 
         elif args.command == 'enroll':
             validated_student_id = validate_student_id(args.student_id)
             validated_course_code = validate_course_code(args.course)
             logging.info("Enrolling student " + str(validated_student_id) +
                          " in course " + validated_course_code)
-            service.enroll(validated_student_id, validated_course_code)
+            backend.enroll(validated_student_id, validated_course_code)
+            if args.paged:
+                print("Student '" + str(validated_student_id) + "' enrolled into " +
+                      validated_course_code + " successfully.")
 
         elif args.command == 'add-grade':
             validated_student_id = validate_student_id(args.student_id)
             validated_grade = parse_grade(args.grade)
             logging.info("Adding grade " + str(validated_grade) + " for student " +
                          str(validated_student_id) + " in course " + args.course)
-            service.add_grade(validated_student_id,
+            backend.add_grade(validated_student_id,
                               args.course, validated_grade)
 
         elif args.command == 'list':
             logging.info("Listing " + args.type)
             if args.type == 'students':
-                students = service.list_students()
-                if len(students) == 0:
-                    print("No students found.")
-                else:
-                    print("Students:")
-                    for s in students:
-                        print("ID: " + str(s['id']) + ", Name: " + s['name'])
-
+                rows = backend.list_students()
+                columns = [("ID", 'id'), ("Name", 'name')]
             elif args.type == 'courses':
-                courses = service.list_courses()
-                if len(courses) == 0:
-                    print("No courses found.")
+                rows = backend.list_courses()
+                columns = [("Code", 'code'), ("Title", 'title')]
+            else:
+                rows = backend.list_enrollments()
+                columns = [("Student ID", 'student_id'),
+                           ("Course", 'course_code'), ("Grades", 'grades')]
+
+            header = None
+            if args.format == 'text':
+                # Paged mode returns iterators, so check for a first row
+                rows = iter(rows)
+                first = next(rows, None)
+                if first is None:
+                    header = "No " + args.type + " found."
+                    rows = []
                 else:
-                    print("Courses:")
-                    for c in courses:
-                        print("Code: " + c['code'] + ", Title: " + c['title'])
-
-            elif args.type == 'enrollments':
-                enrollments = service.list_enrollments()
-                if len(enrollments) == 0:
-                    print("No enrollments found.")
-                else:
-                    print("Enrollments:")
-                    for e in enrollments:
-                        if len(e['grades']) > 0:
-                            grades_display = ""
-                            for grade in e['grades']:
-                                grades_display = grades_display + \
-                                    str(grade) + ", "
-                            grades_display = grades_display[:-2]
-                        else:
-                            grades_display = "No grades yet"
-
-                        print("Student ID: " + str(e['student_id']) +
-                              ", Course: " + e['course_code'] +
-                              ", Grades: [" + grades_display + "]")
+                    header = args.type.capitalize() + ":"
+                    rows = itertools.chain([first], rows)
+                if args.type == 'enrollments':
+                    rows = ({**e, 'grades': "[" + (format_value(e['grades'])
+                                                   or "No grades yet") + "]"}
+                            for e in rows)
+            write_output(rows, columns, args.format, args.output, header)
 
         elif args.command == 'avg':
             validated_student_id = validate_student_id(args.student_id)
             logging.info("Computing average for student " +
                          str(validated_student_id) + " in course " + args.course)
-            average = service.compute_average(
+            average = backend.compute_average(
                 validated_student_id, args.course)
             print("Average grade for student " + str(validated_student_id) +
                   " in " + args.course + ": " + str(round(average, 2)))
@@ -186,10 +223,113 @@ def main():
             validated_student_id = validate_student_id(args.student_id)
             logging.info("Computing GPA for student " +
                          str(validated_student_id))
-            gpa = service.compute_gpa(validated_student_id)
+            gpa = backend.compute_gpa(validated_student_id)
             print("GPA for student " + str(validated_student_id) +
                   ": " + str(round(gpa, 2)))
 
+        elif args.command == 'paginate':
+            logging.info("Converting " + args.path + " to pages in " + args.output)
+            counts = convert(args.path, args.output, args.page_size)
+            print("Converted " + str(counts['students']) + " students, " +
+                  str(counts['courses']) + " courses and " +
+                  str(counts['enrollments']) + " enrollments into " +
+                  args.output + ".")
+
+        elif args.command == 'check':
+            logging.info("Checking integrity of " + args.path)
+            problems = check_integrity(load_data(args.path))
+            if len(problems) == 0:
+                print("No integrity problems found in " + args.path + ".")
+            else:
+                print("Found " + str(len(problems)) + " problem(s):")
+                for problem in problems:
+                    print("- " + problem)
+                sys.exit(1)
+
+        elif args.command == 'query':
+            logging.info("Running query: " + args.expression)
+            rows = run_query(args.expression, load_data(args.path))
+            if len(rows) == 0 and args.format == 'text':
+                print("No results found.")
+            else:
+                columns = [(key, key) for key in rows[0]] if rows else []
+                write_output(rows, columns, args.format, args.output)
+
+        elif args.command == 'report':
+            logging.info("Rendering report for course " + args.course)
+            gradebook = service.Gradebook(args.path)
+            report = gradebook.course_report(args.course, args.format)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    f.write(report)
+            else:
+                sys.stdout.write(report)
+
+        elif args.command == 'ingest':
+            logging.info("Ingesting " + args.file + " with " +
+                         str(args.workers) + " workers")
+            last_report = [0.0]
+
+            def report_progress(stats):
+                now = time.time()
+                if now - last_report[0] >= 1:
+                    last_report[0] = now
+                    print("Ingested " + str(stats['rows']) + " rows (" +
+                          str(round(stats['rows_per_sec'])) + " rows/sec)")
+
+            gradebook = service.Gradebook(args.path, flush_every=10 ** 9)
+            stats = ingest(args.file, gradebook, workers=args.workers,
+                           chunk_size=args.chunk_size,
+                           progress=report_progress)
+            logging.info("Ingested " + str(stats['accepted']) + " grades, " +
+                         str(stats['rejected']) + " rejected")
+
+            print("Ingested " + str(stats['rows']) + " rows in " +
+                  str(round(stats['seconds'], 2)) + " s (" +
+                  str(round(stats['rows_per_sec'])) + " rows/sec)")
+            print("Accepted: " + str(stats['accepted']) +
+                  ", Rejected: " + str(stats['rejected']))
+            for line, message in stats['errors']:
+                print("Line " + str(line) + ": " + message)
+
+        elif args.command == 'maintenance':
+            logging.info("Running maintenance on " + args.path)
+            if args.compact:
+                before, after = maintenance.compact(
+                    args.path, args.generations)
+                print("Compacted " + args.path + ": " + str(before) +
+                      " -> " + str(after) + " bytes")
+
+            print("Data file: " + args.path + " (" +
+                  str(maintenance.file_size(args.path)) + " bytes)")
+            for snapshot in maintenance.list_snapshots(args.path):
+                print("Snapshot: " + snapshot + " (" +
+                      str(maintenance.file_size(snapshot)) + " bytes)")
+
+            print("Estimated write amplification per flush batch size:")
+            estimates = maintenance.estimate_write_amplification(
+                load_data(args.path), args.flush_every)
+            for batch_size, amplification in estimates:
+                print("  flush every " + str(batch_size) + " grades: " +
+                      str(round(amplification, 1)) + "x")
+
+            if args.verify:
+                failed = False
+                for result in maintenance.verify(args.path):
+                    if result['problems']:
+                        failed = True
+                        print(result['path'] + ": " +
+                              str(len(result['problems'])) + " problem(s)")
+                        for problem in result['problems']:
+                            print("  - " + problem)
+                    else:
+                        print(result['path'] + ": OK")
+                if failed:
+                    sys.exit(1)
+
+        if args.paged:
+            backend.close()
+
     except ValueError as e:
         logging.error("ValueError occurred: " + str(e))
         print("Error: " + str(e))
@@ -1,96 +1,233 @@
 """
 Seed script to populate gradebook with sample data.
 
-Creates students, courses, enrollments, and grades for testing purposes.
+Generates a synthetic gradebook of any size and writes it in one bulk
+save through the storage layer, so it can feed benchmarks and stress
+tests. The same arguments and seed always produce the same data.
+
+Distributions:
+    students:    random first and last names, an ability ~ N(75, 10)
+    courses:     department codes such as CS101, a difficulty ~ N(0, 6)
+                 and a popularity that falls off with course rank (Zipf)
+    enrollments: each student takes K distinct courses, picked by popularity
+    grades:      ability - difficulty + N(0, 8), rounded and clipped to 0-100
+
+Usage:
+    python scripts/seed.py
+    python scripts/seed.py --students 100000 --courses 500 \\
+        --enrollments-per-student 5 --grades-per-enrollment 2 --seed 7
 """
 import sys
 import os
-import json
+import argparse
+import bisect
+import heapq
+import itertools
+import math
+import random
+import time
 
 sys.path.insert(0, os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..')))
 
-import gradebook.service as service
-
-def clear_data():
-    """Clear existing gradebook data."""
-    data_path = 'data/gradebook.json'
-    
-    os.makedirs('data', exist_ok=True)
-    
-    empty_data = {
-        'students': [],
-        'courses': [],
-        'enrollments': []
-    }
-    
-    with open(data_path, 'w') as f:
-        json.dump(empty_data, f, indent=2)
-    
-    print("Cleared existing data.")
-
-def seed_data():
-    """Populate the gradebook with sample data."""
-    print("Starting to populate gradebook with data...")
-
-    # Add students
-    print("\nAdding students...")
-    student1_id = service.add_student("Ema Adili")
-    student2_id = service.add_student("Rina Uka")
-    student3_id = service.add_student("Rona Berisha")
-
-    # Add courses
-    print("\nAdding courses...")
-    service.add_course("CS101", "Introduction to Computer Science")
-    service.add_course("ENG102", "English Literature")
-    service.add_course("MATH201", "Advanced Mathematics")
-
-    # Enroll students in courses
-    print("\nEnrolling students...")
-    service.enroll(student1_id, "CS101")
-    service.enroll(student1_id, "ENG102")
-
-    service.enroll(student2_id, "CS101")
-    service.enroll(student2_id, "MATH201")
-
-    service.enroll(student3_id, "CS101")
-    service.enroll(student3_id, "ENG102")
-
-    print("\nAdding grades...")
-
-    # Ema's grades
-    service.add_grade(student1_id, "CS101", 95)
-    service.add_grade(student1_id, "CS101", 88)
-    service.add_grade(student1_id, "CS101", 90)
-
-    service.add_grade(student1_id, "ENG102", 82)
-    service.add_grade(student1_id, "ENG102", 86)
-
-    # Rina's grades
-    service.add_grade(student2_id, "CS101", 75)
-    service.add_grade(student2_id, "CS101", 80)
-    service.add_grade(student2_id, "CS101", 70)
-
-    service.add_grade(student2_id, "MATH201", 90)
-    service.add_grade(student2_id, "MATH201", 92)
-
-    # Rona's grades
-    service.add_grade(student3_id, "CS101", 100)
-    service.add_grade(student3_id, "CS101", 97)
-
-    service.add_grade(student3_id, "ENG102", 85)
-    service.add_grade(student3_id, "ENG102", 88)
-    service.add_grade(student3_id, "ENG102", 91)
-
-    print("\n" + "-" * 50)
+from gradebook.storage import save_data
+
+FIRST_NAMES = [
+    "Ema", "Rina", "Rona", "Arben", "Blerta", "Dardan", "Elira", "Fatos",
+    "Gent", "Hana", "Ilir", "Jeta", "Kaltrina", "Leart", "Mimoza", "Nora",
+    "Olsa", "Petrit", "Qendresa", "Rrezon", "Sara", "Teuta", "Uran",
+    "Valon", "Yllka", "Zana", "Adam", "Alice", "Daniel", "Emily", "James",
+    "Laura", "Liam", "Maria", "Noah", "Olivia", "Rachel", "Ross", "Sofia",
+    "Thomas",
+]
+
+LAST_NAMES = [
+    "Adili", "Uka", "Berisha", "Krasniqi", "Gashi", "Hoxha", "Kelmendi",
+    "Morina", "Shala", "Rama", "Bytyqi", "Hasani", "Osmani", "Ahmeti",
+    "Dervishi", "Brown", "Garcia", "Green", "Johnson", "Miller", "Smith",
+    "Taylor", "Williams", "Wilson",
+]
+
+DEPARTMENTS = [
+    ("CS", "Computer Science"),
+    ("MATH", "Mathematics"),
+    ("ENG", "English Literature"),
+    ("PHYS", "Physics"),
+    ("CHEM", "Chemistry"),
+    ("BIO", "Biology"),
+    ("HIST", "History"),
+    ("ECON", "Economics"),
+    ("PSY", "Psychology"),
+    ("ART", "Art History"),
+]
+
+
+def generate_courses(rng, count):
+    """
+    Generate course records with a difficulty for each.
+
+    Codes run through the departments in turn (CS101, MATH101, ...,
+    CS102, ...), so every code is unique.
+
+    Returns: Tuple of (courses, difficulties)
+    """
+    courses = []
+    difficulties = []
+    for i in range(count):
+        prefix, name = DEPARTMENTS[i % len(DEPARTMENTS)]
+        number = 101 + i // len(DEPARTMENTS)
+        if number == 101:
+            title = f"Introduction to {name}"
+        else:
+            title = f"{name} {number}"
+        courses.append({'code': f"{prefix}{number}", 'title': title})
+        difficulties.append(rng.gauss(0, 6))
+    return courses, difficulties
+
+
+def _popularity(count):
+    """Return cumulative Zipf weights (1/rank) for count courses."""
+    return list(itertools.accumulate(1 / rank for rank in range(1, count + 1)))
+
+
+def _sample_courses(rng, order, cumulative, k):
+    """
+    Pick k distinct course indexes, each with probability by popularity.
+
+    Draws with replacement and drops repeats, which is the same as
+    sampling without replacement. That is fast while k is small next to
+    the number of courses, but repeats pile up as k approaches it. So
+    after 4 * k draws, the rest is picked in one pass over the remaining
+    courses with weighted random keys (Efraimidis-Spirakis).
+
+    Args:
+        rng: random.Random instance
+        order: Course indexes by popularity rank, most popular first
+        cumulative: Cumulative weights of the ranks, from _popularity
+        k: Number of courses to pick
+
+    Returns: Set of course indexes
+    """
+    rand = rng.random
+    total = cumulative[-1] if cumulative else 0
+    taken = set()
+    draws = 4 * k
+    while len(taken) < k and draws:
+        taken.add(order[bisect.bisect(cumulative, rand() * total)])
+        draws -= 1
+    if len(taken) == k:
+        return taken
+
+    # The key log(u) / weight orders the ranks like u ** (1 / weight)
+    # without underflowing; weight is 1 / (rank + 1)
+    remaining = [rank for rank, index in enumerate(order)
+                 if index not in taken]
+    keys = {rank: math.log(1.0 - rand()) * (rank + 1) for rank in remaining}
+    for rank in heapq.nlargest(k - len(taken), remaining, key=keys.get):
+        taken.add(order[rank])
+    return taken
+
+
+def generate(students=100, courses=10, enrollments_per_student=3,
+             grades_per_enrollment=5, seed=0):
+    """
+    Generate a synthetic gradebook.
+
+    Args:
+        students: Number of students
+        courses: Number of courses
+        enrollments_per_student: Distinct courses each student takes
+        grades_per_enrollment: Grades recorded per enrollment
+        seed: Random seed; the same seed gives the same data
+
+    Returns:
+        Dictionary containing students, courses, and enrollments lists
+
+    Raises a ValueError for negative counts or if students would take
+    more courses than exist
+    """
+    if min(students, courses, enrollments_per_student,
+           grades_per_enrollment) < 0:
+        raise ValueError("Counts cannot be negative")
+    if enrollments_per_student > courses:
+        raise ValueError(
+            f"Cannot enroll each student in {enrollments_per_student} "
+            f"courses when there are only {courses}")
+
+    rng = random.Random(seed)
+    course_list, difficulties = generate_courses(rng, courses)
+
+    # Popularity ranks are shuffled so popular courses are spread
+    # across departments
+    order = list(range(courses))
+    rng.shuffle(order)
+    cumulative = _popularity(courses)
+
+    choice = rng.choice
+    gauss = rng.gauss
+    student_list = []
+    enrollments = []
+    for student_id in range(1, students + 1):
+        student_list.append({'id': student_id,
+                             'name': f"{choice(FIRST_NAMES)} {choice(LAST_NAMES)}"})
+        ability = gauss(75, 10)
+
+        taken = _sample_courses(rng, order, cumulative,
+                                enrollments_per_student)
+
+        for index in sorted(taken):
+            mean = ability - difficulties[index]
+            grades = []
+            for _ in range(grades_per_enrollment):
+                grade = round(gauss(mean, 8))
+                grades.append(100 if grade > 100 else 0 if grade < 0 else grade)
+            enrollments.append({'student_id': student_id,
+                                'course_code': course_list[index]['code'],
+                                'grades': grades})
+
+    return {'students': student_list, 'courses': course_list,
+            'enrollments': enrollments}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic gradebook')
+    parser.add_argument('--students', type=int, default=100)
+    parser.add_argument('--courses', type=int, default=10)
+    parser.add_argument('--enrollments-per-student', type=int, default=3)
+    parser.add_argument('--grades-per-enrollment', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='data/gradebook.json',
+                        help='Path of the JSON file to write')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        data = generate(args.students, args.courses,
+                        args.enrollments_per_student,
+                        args.grades_per_enrollment, args.seed)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    generated = time.perf_counter() - start
+
+    size = save_data(data, args.output, verbose=False)
+    if size == 0:
+        print(f"Error: could not write '{args.output}'")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    grade_count = len(data['enrollments']) * args.grades_per_enrollment
     print("Seeding complete!")
     print("\nSummary:")
-    print("- 3 students added")
-    print("- 3 courses added")
-    print("- 6 enrollments created")
-    print("- 15 grades recorded")
-    print("\nData saved to data/gradebook.json")
+    print("- " + str(len(data['students'])) + " students added")
+    print("- " + str(len(data['courses'])) + " courses added")
+    print("- " + str(len(data['enrollments'])) + " enrollments created")
+    print("- " + str(grade_count) + " grades recorded")
+    print(f"\nGenerated in {generated:.2f}s, saved {size} bytes in "
+          f"{elapsed - generated:.2f}s")
+    print("\nData saved to " + args.output)
 
 
 if __name__ == '__main__':
-    seed_data()
+    main()
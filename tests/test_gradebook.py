@@ -0,0 +1,187 @@
+"""
+Unit tests for the thread-safe Gradebook class.
+
+Tests cover the instance API, batched flushes, concurrent writers
+(no lost updates) and concurrent readers.
+"""
+
+import unittest
+import os
+import threading
+from gradebook.service import Gradebook
+from gradebook.locks import RWLock
+from gradebook.storage import load_data
+
+
+class TestGradebook(unittest.TestCase):
+    """Test cases for the Gradebook instance API."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.test_data_path = 'data/test_gradebook_instance.json'
+        os.makedirs('data', exist_ok=True)
+        if os.path.exists(self.test_data_path):
+            os.remove(self.test_data_path)
+
+    def tearDown(self):
+        """Clean up after each test."""
+        if os.path.exists(self.test_data_path):
+            os.remove(self.test_data_path)
+
+    def test_basic_operations(self):
+        """Test that the instance API matches the service functions."""
+        gradebook = Gradebook(self.test_data_path)
+        student_id = gradebook.add_student("Arben Krasniqi")
+        gradebook.add_course("CS101", "Programming 1")
+        gradebook.enroll(student_id, "CS101")
+        gradebook.add_grade(student_id, "CS101", 80)
+        gradebook.add_grade(student_id, "CS101", 100)
+
+        self.assertEqual(student_id, 1)
+        self.assertEqual(gradebook.compute_average(1, "CS101"), 90.0)
+        self.assertEqual(gradebook.compute_gpa(1), 90.0)
+
+        data = load_data(self.test_data_path)
+        self.assertEqual(data['enrollments'][0]['grades'], [80, 100])
+
+    def test_errors_raise(self):
+        """Test that failures raise ValueError instead of printing."""
+        gradebook = Gradebook(self.test_data_path)
+        gradebook.add_course("CS101", "Programming 1")
+
+        with self.assertRaises(ValueError):
+            gradebook.enroll(1, "CS101")
+        with self.assertRaises(ValueError):
+            gradebook.add_course("CS101", "Programming 2")
+        with self.assertRaises(ValueError):
+            gradebook.compute_average(1, "CS101")
+
+    def test_batched_flush(self):
+        """Test that mutations are written once the batch is full."""
+        gradebook = Gradebook(self.test_data_path, flush_every=3)
+        gradebook.add_student("Blerta Hoxha")
+        gradebook.add_student("Dren Osmani")
+
+        self.assertEqual(gradebook.pending, 2)
+        self.assertFalse(os.path.exists(self.test_data_path))
+
+        gradebook.add_student("Erza Sejdiu")
+
+        self.assertEqual(gradebook.pending, 0)
+        self.assertEqual(len(load_data(self.test_data_path)['students']), 3)
+
+    def test_failed_flush_stays_pending(self):
+        """Test that a failed save raises and is retried by the next flush."""
+        blocker = 'data/test_gradebook_blocker'
+        path = os.path.join(blocker, 'gradebook.json')
+        with open(blocker, 'w') as f:
+            f.write("not a directory")
+        try:
+            gradebook = Gradebook(path)
+            with self.assertRaises(OSError):
+                gradebook.add_student("Blerta Hoxha")
+
+            self.assertEqual(gradebook.pending, 1)
+            self.assertEqual(gradebook.stats()['flushes'], 0)
+        finally:
+            os.remove(blocker)
+
+        gradebook.close()
+        self.assertEqual(gradebook.pending, 0)
+        self.assertEqual(load_data(path)['students'],
+                         [{'id': 1, 'name': "Blerta Hoxha"}])
+        os.remove(path)
+        os.rmdir(blocker)
+
+    def test_no_lost_updates(self):
+        """Test that concurrent writers do not lose grades or reuse IDs."""
+        gradebook = Gradebook(self.test_data_path, flush_every=50)
+        gradebook.add_course("CS101", "Programming 1")
+        first = gradebook.add_student("Flamur Berisha")
+        gradebook.enroll(first, "CS101")
+
+        new_ids = []
+
+        def writer():
+            for i in range(200):
+                gradebook.add_grade(first, "CS101", i % 101)
+            new_ids.append(gradebook.add_student("Gresa Morina"))
+
+        def reader():
+            for _ in range(200):
+                gradebook.compute_average(first, "CS101")
+                gradebook.list_enrollments()
+
+        threads = [threading.Thread(target=writer) for _ in range(8)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        gradebook.close()
+
+        self.assertEqual(sorted(new_ids), list(range(2, 10)))
+        data = load_data(self.test_data_path)
+        self.assertEqual(len(data['enrollments'][0]['grades']), 1600)
+        self.assertEqual(len(data['students']), 9)
+
+    def test_query_sees_new_data(self):
+        """Test that cached query indexes are dropped after a mutation."""
+        gradebook = Gradebook(self.test_data_path)
+        gradebook.add_student("Arta Shala")
+        gradebook.add_course("CS101", "Programming 1")
+        gradebook.enroll(1, "CS101")
+
+        self.assertEqual(
+            gradebook.query("enrollments where course_code = CS101 count"),
+            [{'count': 1}])
+
+        gradebook.add_student("Besnik Kelmendi")
+        gradebook.enroll(2, "CS101")
+
+        self.assertEqual(
+            gradebook.query("enrollments where course_code = CS101 count"),
+            [{'count': 2}])
+
+    def test_query_rows_are_copies(self):
+        """Test that changing query results doesn't change stored grades."""
+        gradebook = Gradebook(self.test_data_path)
+        gradebook.add_student("Arta Shala")
+        gradebook.add_course("CS101", "Programming 1")
+        gradebook.enroll(1, "CS101")
+        gradebook.add_grade(1, "CS101", 50)
+
+        rows = gradebook.query("enrollments")
+        rows[0]['grades'].append(1000)
+
+        self.assertEqual(gradebook.compute_average(1, "CS101"), 50.0)
+        self.assertEqual(gradebook.list_enrollments()[0]['grades'], [50])
+
+    def test_readers_share_lock(self):
+        """Test that readers run together while a writer waits."""
+        lock = RWLock()
+        second_reader_in = threading.Event()
+        writer_in = threading.Event()
+
+        def second_reader():
+            with lock.read():
+                second_reader_in.set()
+
+        def writer():
+            with lock.write():
+                writer_in.set()
+
+        with lock.read():
+            threading.Thread(target=second_reader).start()
+            self.assertTrue(second_reader_in.wait(1))
+
+            thread = threading.Thread(target=writer)
+            thread.start()
+            self.assertFalse(writer_in.wait(0.1))
+
+        self.assertTrue(writer_in.wait(1))
+        thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
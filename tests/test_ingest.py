@@ -0,0 +1,120 @@
+"""
+Unit tests for the bulk ingestion pipeline.
+
+Tests cover parsing and validation of chunks, rejected rows, and that
+worker processes give the same result as in-process parsing.
+"""
+
+import unittest
+import os
+from gradebook.ingest import ingest, parse_chunk
+from gradebook.service import Gradebook
+from gradebook.storage import load_data, save_data
+
+
+class TestIngest(unittest.TestCase):
+    """Test cases for ingest and parse_chunk."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.test_data_path = 'data/test_ingest.json'
+        self.test_csv_path = 'data/test_ingest.csv'
+        os.makedirs('data', exist_ok=True)
+
+        save_data({
+            'students': [{'id': 1, 'name': "Arben Krasniqi"},
+                         {'id': 2, 'name': "Blerta Hoxha"}],
+            'courses': [{'code': "CS101", 'title': "Programming 1"}],
+            'enrollments': [
+                {'student_id': 1, 'course_code': "CS101", 'grades': []},
+                {'student_id': 2, 'course_code': "CS101", 'grades': []}
+            ]
+        }, self.test_data_path, verbose=False)
+
+        with open(self.test_csv_path, 'w') as f:
+            f.write("student_id,course_code,grade\n")
+            for i in range(500):
+                f.write(f"{i % 2 + 1},CS101,{i % 101}\n")
+            f.write("3,CS101,80\n")
+            f.write("1,CS101,150\n")
+
+    def tearDown(self):
+        """Clean up after each test."""
+        for path in (self.test_data_path, self.test_csv_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_parse_chunk(self):
+        """Test that rows are validated with the CLI rules."""
+        rows, errors = parse_chunk(10, ["1,CS101,95", "x,CS101,90",
+                                        "2,CS101", "", "2,CS101,-1"])
+
+        self.assertEqual(rows, [(1, "CS101", 95.0, 10)])
+        self.assertEqual([line for line, _ in errors], [11, 12, 14])
+        self.assertIn("Student ID must be a number", errors[0][1])
+
+    def test_stray_quote_only_rejects_its_line(self):
+        """Test that an unbalanced quote doesn't swallow the following rows."""
+        with open(self.test_csv_path, 'w') as f:
+            f.write('student_id,course_code,grade\n"1,CS101,50\n')
+            for grade in range(60, 65):
+                f.write(f"2,CS101,{grade}\n")
+        gradebook = Gradebook(self.test_data_path, flush_every=10 ** 6)
+        stats = ingest(self.test_csv_path, gradebook, chunk_size=4)
+
+        self.assertEqual(stats['rows'], 6)
+        self.assertEqual(stats['accepted'], 5)
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual([line for line, _ in stats['errors']], [2])
+        self.assertEqual(gradebook.compute_average(2, "CS101"), 62.0)
+
+    def test_first_line_is_only_skipped_if_header(self):
+        """Test that a malformed first row is rejected, not taken as a header."""
+        for first, rejected in (("\ufeffstudent_id,course_code,grade", 0),
+                                ("abc,CS101,90", 1),
+                                ("\ufeff1,CS101,90", 0)):
+            self.setUp()
+            with open(self.test_csv_path, 'w', encoding='utf-8') as f:
+                f.write(first + "\n2,CS101,80\n")
+            gradebook = Gradebook(self.test_data_path, flush_every=10 ** 6)
+            stats = ingest(self.test_csv_path, gradebook)
+
+            self.assertEqual(stats['rejected'], rejected)
+            self.assertEqual(stats['rows'], 2 if first[-2:] == "90" else 1)
+        self.assertEqual(load_data(self.test_data_path)['enrollments'][0]['grades'],
+                         [90.0])
+
+    def test_ingest_in_process(self):
+        """Test ingesting without worker processes."""
+        gradebook = Gradebook(self.test_data_path, flush_every=10 ** 6)
+        stats = ingest(self.test_csv_path, gradebook, chunk_size=64)
+
+        self.assertEqual(stats['rows'], 502)
+        self.assertEqual(stats['accepted'], 500)
+        self.assertEqual(stats['rejected'], 2)
+        self.assertEqual(stats['errors'][0][0], 502)
+        self.assertIn("Enrollment not found", stats['errors'][0][1])
+
+        data = load_data(self.test_data_path)
+        self.assertEqual(len(data['enrollments'][0]['grades']), 250)
+
+    def test_workers_match_in_process(self):
+        """Test that worker processes commit the same grades in file order."""
+        gradebook = Gradebook(self.test_data_path, flush_every=10 ** 6)
+        expected = ingest(self.test_csv_path, gradebook, chunk_size=64)
+        expected_data = load_data(self.test_data_path)
+
+        self.setUp()
+        progress = []
+        gradebook = Gradebook(self.test_data_path, flush_every=10 ** 6)
+        stats = ingest(self.test_csv_path, gradebook, workers=2,
+                       chunk_size=64, progress=progress.append)
+
+        self.assertEqual(stats['accepted'], expected['accepted'])
+        self.assertEqual(stats['errors'], expected['errors'])
+        self.assertEqual(len(progress), 8)
+        self.assertEqual(load_data(self.test_data_path), expected_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
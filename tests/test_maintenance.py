@@ -0,0 +1,109 @@
+"""
+Unit tests for storage maintenance.
+
+Tests cover compact saves, snapshot generations, recovery from a
+corrupted data file, timed background flushes and write statistics.
+"""
+
+import unittest
+import os
+import time
+from gradebook import maintenance
+from gradebook.service import Gradebook
+from gradebook.storage import load_data, save_data, snapshot_path
+
+
+class TestMaintenance(unittest.TestCase):
+    """Test cases for compaction, snapshots and flushing."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.test_data_path = 'data/test_maintenance.json'
+        os.makedirs('data', exist_ok=True)
+        self.data = {
+            'students': [{'id': 1, 'name': "Arben Krasniqi"}],
+            'courses': [{'code': "CS101", 'title': "Programming 1"}],
+            'enrollments': [
+                {'student_id': 1, 'course_code': "CS101", 'grades': [80, 90]}
+            ]
+        }
+
+    def tearDown(self):
+        """Clean up after each test."""
+        for path in [self.test_data_path] + \
+                maintenance.list_snapshots(self.test_data_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_compact(self):
+        """Test that compacting shrinks a pretty-printed file."""
+        save_data(self.data, self.test_data_path, verbose=False, compact=False)
+
+        before, after = maintenance.compact(self.test_data_path)
+
+        self.assertLess(after, before)
+        self.assertEqual(load_data(self.test_data_path), self.data)
+
+    def test_snapshot_generations(self):
+        """Test that only the requested number of generations is kept."""
+        for i in range(5):
+            self.data['students'][0]['id'] = i + 1
+            save_data(self.data, self.test_data_path, verbose=False,
+                      generations=2)
+
+        snapshots = maintenance.list_snapshots(self.test_data_path)
+        self.assertEqual(len(snapshots), 2)
+        self.assertEqual(load_data(snapshots[0])['students'][0]['id'], 4)
+        self.assertEqual(load_data(snapshots[1])['students'][0]['id'], 3)
+
+    def test_recover_from_snapshot(self):
+        """Test that a corrupted file is loaded from the newest snapshot."""
+        save_data(self.data, self.test_data_path, verbose=False)
+        save_data(self.data, self.test_data_path, verbose=False, generations=1)
+        with open(self.test_data_path, 'w') as f:
+            f.write('{"students": [')
+
+        data = load_data(self.test_data_path)
+
+        self.assertEqual(data, self.data)
+        results = maintenance.verify(self.test_data_path)
+        self.assertTrue(results[0]['problems'])
+        self.assertEqual(results[1]['path'],
+                         snapshot_path(self.test_data_path, 1))
+        self.assertEqual(results[1]['problems'], [])
+
+    def test_background_flush(self):
+        """Test that pending mutations are flushed after the interval."""
+        gradebook = Gradebook(self.test_data_path, flush_every=1000,
+                              flush_interval=0.05)
+        gradebook.add_student("Blerta Hoxha")
+        self.assertEqual(gradebook.pending, 1)
+
+        deadline = time.time() + 2
+        while gradebook.pending and time.time() < deadline:
+            time.sleep(0.01)
+        gradebook.close()
+
+        self.assertEqual(gradebook.pending, 0)
+        self.assertEqual(len(load_data(self.test_data_path)['students']), 1)
+
+    def test_write_amplification(self):
+        """Test that batching lowers the measured write amplification."""
+        results = []
+        for flush_every in (1, 20):
+            save_data(self.data, self.test_data_path, verbose=False)
+            gradebook = Gradebook(self.test_data_path, flush_every=flush_every)
+            for _ in range(20):
+                gradebook.add_grade(1, "CS101", 75)
+            gradebook.close()
+            results.append(gradebook.stats())
+
+        self.assertEqual(results[0]['flushes'], 20)
+        self.assertEqual(results[1]['flushes'], 1)
+        self.assertEqual(results[0]['logical_bytes'], 60)
+        self.assertGreater(results[0]['write_amplification'],
+                           results[1]['write_amplification'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Unit tests for the paged, memory-bounded gradebook.
+
+Tests cover the streaming JSON parser, conversion, operations across
+evicted pages, the cache budget and peak memory of a real process.
+"""
+
+import unittest
+import os
+import json
+import shutil
+import subprocess
+import sys
+from gradebook.paged import (PagedGradebook, convert, iter_json_items,
+                             parse_size)
+
+PEAK_RSS_SCRIPT = """
+import re, sys
+sys.path.insert(0, {root!r})
+{body}
+with open('/proc/self/status') as f:
+    print(re.search(r'VmHWM:\\s+(\\d+)', f.read()).group(1))
+"""
+
+
+def peak_rss_kb(body):
+    """Run body in a fresh Python process and return its peak RSS in KB."""
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    script = PEAK_RSS_SCRIPT.format(root=root, body=body)
+    result = subprocess.run([sys.executable, '-c', script],
+                            capture_output=True, text=True, check=True)
+    return int(result.stdout.strip())
+
+
+class TestPaged(unittest.TestCase):
+    """Test cases for PagedGradebook and convert."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.test_data_path = 'data/test_paged.json'
+        self.test_pages_path = 'data/test_paged'
+        os.makedirs('data', exist_ok=True)
+
+        self.data = {
+            'students': [{'id': i, 'name': f"Student {i}"}
+                         for i in range(1, 41)],
+            'courses': [{'code': "CS101", 'title': "Programming 1"},
+                        {'code': "MATH201", 'title': "Calculus"}],
+            'enrollments': [{'student_id': i, 'course_code': code,
+                             'grades': [i % 50 + 50, 80]}
+                            for i in range(40, 0, -1)
+                            for code in ("MATH201", "CS101")]
+        }
+        with open(self.test_data_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+
+    def tearDown(self):
+        """Clean up after each test."""
+        if os.path.exists(self.test_data_path):
+            os.remove(self.test_data_path)
+        shutil.rmtree(self.test_pages_path, ignore_errors=True)
+
+    def test_parse_size(self):
+        """Test parsing memory limits."""
+        self.assertEqual(parse_size("256MB"), 256 * 1024 * 1024)
+        self.assertEqual(parse_size("64k"), 64 * 1024)
+        self.assertEqual(parse_size("1000"), 1000)
+        with self.assertRaises(ValueError):
+            parse_size("lots")
+
+    def test_streaming_parser(self):
+        """Test that items are streamed correctly even with tiny reads."""
+        items = list(iter_json_items(self.test_data_path, chunk_size=5))
+
+        self.assertEqual([i for k, i in items if k == 'students'],
+                         self.data['students'])
+        self.assertEqual([i for k, i in items if k == 'enrollments'],
+                         self.data['enrollments'])
+
+    def test_operations_match_json(self):
+        """Test that paged results match the JSON gradebook."""
+        convert(self.test_data_path, self.test_pages_path, page_size=8)
+        gradebook = PagedGradebook(self.test_pages_path, max_memory=1024)
+
+        expected = sorted(self.data['enrollments'],
+                          key=lambda e: (e['student_id'], e['course_code']))
+        self.assertEqual(list(gradebook.list_enrollments()), expected)
+        self.assertEqual(list(gradebook.list_students()),
+                         self.data['students'])
+        self.assertEqual(gradebook.compute_gpa(7), 68.5)
+        self.assertEqual(gradebook.compute_average(7, "CS101"), 68.5)
+
+        with self.assertRaises(ValueError):
+            gradebook.compute_gpa(99)
+        with self.assertRaises(ValueError):
+            gradebook.add_grade(7, "ART210", 90)
+
+    def test_failed_convert_can_be_rerun(self):
+        """Test that a failed conversion leaves nothing to append to."""
+        text = json.dumps(self.data)
+        with open(self.test_data_path, 'w') as f:
+            f.write(text[:len(text) * 2 // 3])
+        with self.assertRaises(ValueError):
+            convert(self.test_data_path, self.test_pages_path, page_size=8,
+                    buffer_records=10)
+        self.assertFalse(os.path.exists(self.test_pages_path))
+        self.assertFalse(os.path.exists(self.test_pages_path + ".tmp"))
+
+        with open(self.test_data_path, 'w') as f:
+            json.dump(self.data, f)
+        convert(self.test_data_path, self.test_pages_path, page_size=8)
+        gradebook = PagedGradebook(self.test_pages_path)
+        self.assertEqual(list(gradebook.list_students()),
+                         self.data['students'])
+
+        with self.assertRaises(ValueError):
+            convert(self.test_data_path, self.test_pages_path, page_size=8)
+
+    def test_changes_survive_eviction(self):
+        """Test that dirty pages are written back when evicted."""
+        convert(self.test_data_path, self.test_pages_path, page_size=8)
+        gradebook = PagedGradebook(self.test_pages_path, max_memory=10000)
+
+        for student_id in range(1, 41):
+            gradebook.add_grade(student_id, "CS101", 100)
+            self.assertLessEqual(gradebook.cached_bytes, 10000)
+        new_id = gradebook.add_student("Arben Krasniqi")
+        gradebook.enroll(new_id, "CS101")
+        gradebook.add_grade(new_id, "CS101", 90)
+        gradebook.close()
+
+        reopened = PagedGradebook(self.test_pages_path)
+        self.assertEqual(new_id, 41)
+        self.assertEqual(reopened.compute_gpa(41), 90.0)
+        self.assertEqual(reopened.compute_average(1, "CS101"),
+                         (51 + 80 + 100) / 3)
+
+    @unittest.skipUnless(os.path.exists('/proc/self/status'),
+                         "needs /proc to read peak RSS")
+    def test_peak_rss_is_bounded(self):
+        """Test that paged mode uses far less memory than loading the JSON."""
+        enrollment_count = 60000
+        with open(self.test_data_path, 'w') as f:
+            f.write('{"students":[')
+            f.write(",".join('{"id":%d,"name":"Student %d"}' % (i, i)
+                             for i in range(1, enrollment_count // 4 + 1)))
+            f.write('],"courses":[' + ",".join(
+                '{"code":"C%03d","title":"Course %d"}' % (i, i)
+                for i in range(50)))
+            f.write('],"enrollments":[')
+            f.write(",".join(
+                '{"student_id":%d,"course_code":"C%03d","grades":[%d,50,60,70,80]}'
+                % (i // 4 + 1, i % 50, i % 101) for i in range(enrollment_count)))
+            f.write(']}')
+        convert(self.test_data_path, self.test_pages_path, page_size=128)
+
+        max_memory = 2 * 1024 * 1024
+        baseline = peak_rss_kb("import gradebook.paged, gradebook.storage")
+        full = peak_rss_kb(
+            "from gradebook.storage import load_data\n"
+            f"data = load_data({self.test_data_path!r})")
+        paged = peak_rss_kb(
+            "from gradebook.paged import PagedGradebook\n"
+            f"g = PagedGradebook({self.test_pages_path!r}, {max_memory})\n"
+            f"for sid in range(1, {enrollment_count // 4}, 101):\n"
+            "    g.compute_gpa(sid)\n"
+            "    g.add_grade(sid, 'C%03d' % ((sid - 1) * 4 % 50), 90)\n"
+            "count = sum(1 for _ in g.list_enrollments())\n"
+            "g.close()")
+
+        self.assertLess(paged - baseline, (full - baseline) / 3)
+        self.assertLess((paged - baseline) * 1024, max_memory * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for the query engine.
+
+Tests cover filtering, grouping, aggregates, joins, index use
+and the expression parser.
+"""
+
+import unittest
+from gradebook.query import Query, Indexes, parse, run_query
+
+
+class TestQuery(unittest.TestCase):
+    """Test cases for queries over gradebook data."""
+
+    def setUp(self):
+        """Set up sample data before each test."""
+        self.data = {
+            'students': [
+                {'id': 1, 'name': "Arben Krasniqi"},
+                {'id': 2, 'name': "Blerta Hoxha"},
+                {'id': 3, 'name': "Dren Osmani"}
+            ],
+            'courses': [
+                {'code': "CS101", 'title': "Programming 1"},
+                {'code': "MATH201", 'title': "Calculus"}
+            ],
+            'enrollments': [
+                {'student_id': 1, 'course_code': "CS101", 'grades': [80, 90]},
+                {'student_id': 1, 'course_code': "MATH201", 'grades': [70]},
+                {'student_id': 2, 'course_code': "CS101", 'grades': [100]},
+                {'student_id': 3, 'course_code': "MATH201", 'grades': []}
+            ]
+        }
+
+    def test_average_per_course(self):
+        """Test grouping enrollments by course with an average of all grades."""
+        rows = run_query("enrollments group by course_code avg grades",
+                         self.data)
+
+        self.assertEqual(rows, [
+            {'course_code': "CS101", 'avg_grades': 90.0},
+            {'course_code': "MATH201", 'avg_grades': 70.0}
+        ])
+
+    def test_students_per_course(self):
+        """Test that group by without an aggregate counts rows."""
+        rows = run_query("enrollments group by course_code", self.data)
+
+        self.assertEqual([r['count'] for r in rows], [2, 2])
+
+    def test_students_in_both_courses(self):
+        """Test the has operator on the derived courses field."""
+        rows = run_query(
+            "students where courses has CS101 and courses has MATH201",
+            self.data)
+
+        self.assertEqual([r['name'] for r in rows], ["Arben Krasniqi"])
+
+    def test_join_filter_and_sort(self):
+        """Test joining students and filtering on a derived field."""
+        rows = run_query(
+            "enrollments join students where average >= 70 sort average desc",
+            self.data)
+
+        self.assertEqual([(r['name'], r['average']) for r in rows], [
+            ("Blerta Hoxha", 100.0),
+            ("Arben Krasniqi", 85.0),
+            ("Arben Krasniqi", 70.0)
+        ])
+
+    def test_aggregates_without_group(self):
+        """Test count, min and max over the whole table."""
+        self.assertEqual(run_query("enrollments count", self.data),
+                         [{'count': 4}])
+        self.assertEqual(run_query("enrollments min grades", self.data),
+                         [{'min_grades': 70}])
+        self.assertEqual(
+            Query(self.data, 'students').aggregate('max', 'gpa').run(),
+            [{'max_gpa': 100.0}])
+
+    def test_equality_uses_index(self):
+        """Test that an equality predicate on an indexed field uses the index."""
+        indexes = Indexes(self.data)
+        rows = run_query("enrollments where course_code = MATH201 limit 1",
+                         self.data, indexes)
+
+        self.assertEqual(len(rows), 1)
+        self.assertIn(('enrollments', 'course_code'), indexes._built)
+
+    def test_invalid_queries(self):
+        """Test that malformed expressions raise ValueError."""
+        for expression in ("grades", "students where id ~ 1",
+                           "students group id", "courses join students",
+                           "enrollments avg", "students limit many"):
+            with self.assertRaises(ValueError):
+                parse(expression, self.data).run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Unit tests for the rendering layer and the course report cache.
+"""
+
+import unittest
+import os
+import io
+import json
+from gradebook.render import render, render_to_string
+from gradebook.service import Gradebook
+
+
+class TestRender(unittest.TestCase):
+    """Test cases for output formats and cached course reports."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.test_data_path = 'data/test_render.json'
+        os.makedirs('data', exist_ok=True)
+        if os.path.exists(self.test_data_path):
+            os.remove(self.test_data_path)
+
+        self.rows = [{'id': 1, 'name': "Arben Krasniqi", 'grades': [80, 90]},
+                     {'id': 12, 'name': "Blerta, Hoxha", 'grades': []}]
+        self.columns = [("ID", 'id'), ("Name", 'name'), ("Grades", 'grades')]
+
+    def tearDown(self):
+        """Clean up after each test."""
+        if os.path.exists(self.test_data_path):
+            os.remove(self.test_data_path)
+
+    def test_formats(self):
+        """Test the text, csv, jsonl and table formats."""
+        self.assertEqual(
+            render_to_string(self.rows, self.columns, 'text'),
+            "ID: 1, Name: Arben Krasniqi, Grades: 80, 90\n"
+            "ID: 12, Name: Blerta, Hoxha, Grades: \n")
+        self.assertEqual(
+            render_to_string(self.rows, self.columns, 'csv'),
+            'ID,Name,Grades\n1,Arben Krasniqi,"80, 90"\n12,"Blerta, Hoxha",\n')
+
+        lines = render_to_string(self.rows, self.columns, 'jsonl').splitlines()
+        self.assertEqual(json.loads(lines[1]),
+                         {'id': 12, 'name': "Blerta, Hoxha", 'grades': []})
+
+        self.assertEqual(
+            render_to_string(self.rows, self.columns, 'table').splitlines(),
+            ["ID  Name            Grades",
+             "--  --------------  ------",
+             "1   Arben Krasniqi  80, 90",
+             "12  Blerta, Hoxha"])
+
+    def test_batched_writes(self):
+        """Test that rows are written in batches, not one call per row."""
+        class CountingWriter(io.StringIO):
+            calls = 0
+
+            def write(self, text):
+                CountingWriter.calls += 1
+                return super().write(text)
+
+        out = CountingWriter()
+        rows = ({'id': i, 'name': "Student"} for i in range(12000))
+        count = render(rows, self.columns[:2], 'jsonl', out)
+
+        self.assertEqual(count, 12000)
+        self.assertEqual(CountingWriter.calls, 3)
+        self.assertEqual(len(out.getvalue().splitlines()), 12000)
+
+    def test_unknown_format(self):
+        """Test that an unknown format raises ValueError."""
+        with self.assertRaises(ValueError):
+            render_to_string(self.rows, self.columns, 'xml')
+
+    def test_report_cache(self):
+        """Test that only the changed course's report is rendered again."""
+        gradebook = Gradebook(self.test_data_path)
+        gradebook.add_student("Dren Osmani")
+        gradebook.add_course("CS101", "Programming 1")
+        gradebook.add_course("MATH201", "Calculus")
+        gradebook.enroll(1, "CS101")
+        gradebook.enroll(1, "MATH201")
+        gradebook.add_grade(1, "CS101", 90)
+
+        first = gradebook.course_report("CS101")
+        self.assertIn("Dren Osmani", first)
+        gradebook.course_report("MATH201")
+        self.assertIs(gradebook.course_report("CS101"), first)
+
+        gradebook.add_grade(1, "MATH201", 70)
+
+        self.assertIs(gradebook.course_report("CS101"), first)
+        self.assertIn("70", gradebook.course_report("MATH201"))
+        self.assertEqual(gradebook._reports.hits, 2)
+        self.assertEqual(gradebook._reports.misses, 3)
+
+        gradebook.add_grade(1, "CS101", 100)
+
+        self.assertIn("95.0", gradebook.course_report("CS101"))
+
+    def test_report_with_dangling_enrollment(self):
+        """Test that an enrollment of a missing student is labelled."""
+        with open(self.test_data_path, 'w') as f:
+            json.dump({'students': [],
+                       'courses': [{'code': "CS101", 'title': "Programming 1"}],
+                       'enrollments': [{'student_id': 7, 'course_code': "CS101",
+                                        'grades': [80]}]}, f)
+
+        report = Gradebook(self.test_data_path).course_report("CS101")
+
+        self.assertIn("(unknown student)", report)
+        self.assertIn("80.0", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
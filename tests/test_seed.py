@@ -0,0 +1,65 @@
+"""
+Unit tests for the synthetic data generator in scripts/seed.py.
+
+Tests cover reproducibility, record counts, grade ranges and the
+integrity of the generated data.
+"""
+
+import unittest
+import os
+import importlib.util
+from gradebook.validation import check_integrity
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'seed.py')
+spec = importlib.util.spec_from_file_location('seed', SEED_PATH)
+seed = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(seed)
+
+
+class TestSeed(unittest.TestCase):
+    """Test cases for the generate function of the seed script."""
+
+    def test_same_seed_gives_same_data(self):
+        """Test that a seed always produces the same gradebook."""
+        first = seed.generate(200, 20, 4, 3, seed=5)
+        self.assertEqual(first, seed.generate(200, 20, 4, 3, seed=5))
+        self.assertNotEqual(first, seed.generate(200, 20, 4, 3, seed=6))
+
+    def test_counts_and_integrity(self):
+        """Test record counts, grade ranges and the integrity scan."""
+        data = seed.generate(300, 25, 4, 3, seed=1)
+        self.assertEqual(len(data['students']), 300)
+        self.assertEqual(len(data['courses']), 25)
+        self.assertEqual(len(data['enrollments']), 1200)
+        self.assertEqual(check_integrity(data), [])
+        for enrollment in data['enrollments']:
+            self.assertEqual(len(enrollment['grades']), 3)
+            self.assertTrue(all(0 <= g <= 100 for g in enrollment['grades']))
+
+    def test_popular_courses_have_more_students(self):
+        """Test that enrollments follow course popularity."""
+        data = seed.generate(2000, 30, 2, 1, seed=2)
+        counts = {}
+        for enrollment in data['enrollments']:
+            code = enrollment['course_code']
+            counts[code] = counts.get(code, 0) + 1
+        ordered = sorted(counts.values(), reverse=True)
+        self.assertGreater(ordered[0], 3 * ordered[-1])
+
+    def test_every_course_taken(self):
+        """Test that students can take every course without stalling."""
+        data = seed.generate(50, 40, 40, 1, seed=3)
+
+        self.assertEqual(len(data['enrollments']), 2000)
+        self.assertEqual(check_integrity(data), [])
+
+    def test_invalid_counts(self):
+        """Test that impossible counts raise ValueError."""
+        with self.assertRaises(ValueError):
+            seed.generate(10, 3, 4, 1)
+        with self.assertRaises(ValueError):
+            seed.generate(-1, 3, 1, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -34,6 +34,8 @@ class TestGradebookService(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after each test."""
+        service.load_data = load_data
+        service.save_data = save_data
         if os.path.exists(self.test_data_path):
             os.remove(self.test_data_path)
 
@@ -0,0 +1,134 @@
+"""
+Unit tests for the gradebook validation layer.
+
+Tests cover the shared validators, trusted model construction,
+and the integrity scan run by load_data.
+"""
+
+import unittest
+import os
+import json
+from gradebook.models import Enrollment
+from gradebook.storage import load_data
+from gradebook.validation import (validate_grades, validate_grade, parse_grade,
+                                  validate_student_id, check_integrity)
+
+
+class TestValidation(unittest.TestCase):
+    """Test cases for validation functions."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.test_data_path = 'data/test_validation.json'
+        os.makedirs('data', exist_ok=True)
+
+        self.data = {
+            'students': [{'id': 1, 'name': "Arben Krasniqi"}],
+            'courses': [{'code': "CS101", 'title': "Programming 1"}],
+            'enrollments': [
+                {'student_id': 1, 'course_code': "CS101", 'grades': [80, 90]}
+            ]
+        }
+
+    def tearDown(self):
+        """Clean up after each test."""
+        if os.path.exists(self.test_data_path):
+            os.remove(self.test_data_path)
+
+    def test_validate_grades(self):
+        """Test that a list of grades is checked in one call."""
+        self.assertEqual(validate_grades([0, 55.5, 100]), [0, 55.5, 100])
+        self.assertEqual(validate_grades([]), [])
+
+        with self.assertRaises(TypeError):
+            validate_grades([90, "A+"])
+        with self.assertRaises(ValueError):
+            validate_grades([90, 101])
+        with self.assertRaises(TypeError):
+            validate_grades((90, 80))
+
+    def test_nan_grades_rejected(self):
+        """Test that NaN and infinite grades are rejected wherever they are."""
+        nan = float('nan')
+        for grades in ([nan], [nan, 150], [150, nan], [80, nan, 90]):
+            with self.assertRaises(ValueError):
+                validate_grades(grades)
+        with self.assertRaises(ValueError):
+            validate_grade(nan)
+        for text in ("nan", "inf", "-inf"):
+            with self.assertRaises(ValueError):
+                validate_grade(parse_grade(text))
+
+    def test_parse_input(self):
+        """Test parsing grades and student IDs from CLI strings."""
+        self.assertEqual(parse_grade("95"), 95.0)
+        # The range is left to validate_grade at the service boundary
+        self.assertEqual(parse_grade("150"), 150.0)
+        self.assertEqual(validate_student_id("3"), 3)
+
+        with self.assertRaises(ValueError):
+            parse_grade("abc")
+        with self.assertRaises(ValueError):
+            validate_student_id("0")
+
+    def test_trusted_enrollment_skips_checks(self):
+        """Test that trusted mode does not validate grades."""
+        with self.assertRaises(ValueError):
+            Enrollment(1, "CS101", [150])
+
+        enrollment = Enrollment(1, "CS101", [150], trusted=True)
+        self.assertEqual(enrollment.grades, [150])
+
+    def test_integrity_of_valid_data(self):
+        """Test that valid data has no integrity problems."""
+        self.assertEqual(check_integrity(self.data), [])
+
+    def test_integrity_problems(self):
+        """Test that dangling, duplicate and out-of-range records are reported."""
+        self.data['students'].append({'id': 1, 'name': "Blerta Hoxha"})
+        self.data['enrollments'].append(
+            {'student_id': 2, 'course_code': "MATH201", 'grades': [120]})
+
+        problems = check_integrity(self.data)
+
+        self.assertEqual(len(problems), 4)
+        self.assertIn("Duplicate student id 1", problems)
+        self.assertIn("Enrollment references unknown student 2", problems)
+        self.assertIn("Enrollment references unknown course MATH201", problems)
+        self.assertIn("between 0 and 100", problems[3])
+
+    def test_integrity_of_malformed_data(self):
+        """Test that malformed records are reported instead of raising."""
+        self.data['students'].extend([["not", "a", "record"],
+                                      {'id': [1], 'name': "Unhashable"},
+                                      {'name': "No ID"}])
+        self.data['enrollments'].append({'student_id': {}, 'grades': []})
+        self.data['courses'] = "CS101"
+
+        problems = check_integrity(self.data)
+
+        self.assertIn("Record 1 in 'students' is not an object", problems)
+        self.assertIn("Student has an invalid id [1]", problems)
+        self.assertIn("Student has an invalid id None", problems)
+        self.assertIn("'courses' must be a list", problems)
+        self.assertTrue(any(p.startswith("Enrollment has an invalid")
+                            for p in problems))
+        self.assertEqual(check_integrity([]), ["Data must be a JSON object"])
+
+    def test_load_data_verify(self):
+        """Test that load_data raises on bad data only when verify is set."""
+        self.data['enrollments'][0]['course_code'] = "MATH201"
+        with open(self.test_data_path, 'w') as f:
+            json.dump(self.data, f)
+
+        data = load_data(self.test_data_path)
+        self.assertEqual(len(data['enrollments']), 1)
+
+        with self.assertRaises(ValueError) as context:
+            load_data(self.test_data_path, verify=True)
+
+        self.assertIn("Integrity check failed", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()